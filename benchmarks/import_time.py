@@ -0,0 +1,85 @@
+"""Misst die Startzeit der Kommandozeile und schlägt fehl, wenn sie das Budget überschreitet.
+
+Jede Messung läuft in einem frischen Interpreter, damit bereits geladene Module das
+Ergebnis nicht verfälschen. Zusätzlich wird geprüft, dass beim Start weder requests
+noch Qt geladen werden.
+
+Aufruf (aus dem Projektordner):
+
+    python benchmarks/import_time.py --budget 0.12 --runs 7
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Module, die beim Start der Kommandozeile nicht geladen werden dürfen
+FORBIDDEN = ("requests", "urllib3", "PyQt6")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import fotoparadies.main
+elapsed = time.perf_counter() - start
+print(json.dumps({"elapsed": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def measure() -> tuple[float, list[str]]:
+    """Importiert die Kommandozeile in einem frischen Interpreter
+
+    Returns:
+        tuple[float, list[str]]: Dauer des Imports in Sekunden und alle geladenen Module
+    """
+    process = subprocess.run(
+        [sys.executable, "-c", _PROBE], cwd=ROOT, capture_output=True, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(process.stderr.strip())
+    result = json.loads(process.stdout)
+    return result["elapsed"], result["modules"]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=0.12, help="Erlaubte Importzeit (Median) in Sekunden"
+    )
+    parser.add_argument("--runs", type=int, default=7, help="Anzahl der Messungen")
+    args = parser.parse_args()
+
+    timings = []
+    modules: list[str] = []
+    for _ in range(args.runs):
+        try:
+            elapsed, modules = measure()
+        except RuntimeError as error:
+            print(f"FEHLER: fotoparadies.main lässt sich nicht importieren:\n{error}")
+            return 2
+        timings.append(elapsed)
+
+    median = statistics.median(timings)
+    print(f"Import von fotoparadies.main: Median {median * 1000:.1f} ms, "
+          f"Minimum {min(timings) * 1000:.1f} ms ({args.runs} Läufe)")
+
+    failed = False
+    loaded = [
+        name for name in FORBIDDEN
+        if any(module == name or module.startswith(name + ".") for module in modules)
+    ]
+    if loaded:
+        print(f"FEHLER: beim Start geladen: {', '.join(loaded)}")
+        failed = True
+    if median > args.budget:
+        print(f"FEHLER: Budget von {args.budget * 1000:.0f} ms überschritten")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
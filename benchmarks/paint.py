@@ -0,0 +1,135 @@
+"""Misst das Zeichnen der Auftragskarten beim Scrollen, mit und ohne Zwischenspeicher.
+
+Vorher wird geprüft, dass die zwischengespeicherten Kartenhintergründe dem direkten
+Zeichnen entsprechen. Weil die halbtransparente Karte erst in die Pixmap und dann auf
+den Hintergrund gezeichnet wird, dürfen einzelne Kantenpixel durch Rundung um eine
+Stufe abweichen, mehr nicht. Läuft ohne Bildschirm (Qt-Plattform offscreen).
+
+Aufruf (aus dem Projektordner):
+
+    python benchmarks/paint.py --orders 300 --frames 200
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtGui import QColor, QImage, QPainter  # noqa: E402
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+
+from fotoparadies import gui  # noqa: E402
+from fotoparadies.fotoparadies import FotoparadiesStatus  # noqa: E402
+from fotoparadies.theme import THEMES  # noqa: E402
+
+STATUSES = (None, "PROCESSING", "READY", "DELIVERED", "ERROR")
+
+
+def _render(width: int, height: int, status, dark: bool, cached: bool) -> QImage:
+    image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
+    # Hintergrund von Fenster und Auftragsliste im jeweiligen Farbschema
+    image.fill(QColor(THEMES[dark].window))
+    painter = QPainter(image)
+    if cached:
+        gui.card_backgrounds.set_dark(dark)
+        painter.drawPixmap(0, 0, gui.card_backgrounds.pixmap(width, height, status))
+    else:
+        gui.paint_card_background(painter, width, height, status, dark)
+    painter.end()
+    return image
+
+
+def compare(width: int = 760, height: int = 68) -> tuple[int, int]:
+    """Vergleicht direktes Zeichnen und Zwischenspeicher für alle Status und Farbschemata
+
+    Returns:
+        tuple[int, int]: Anzahl abweichender Pixel und größte Abweichung eines Farbkanals
+    """
+    differences = 0
+    largest = 0
+    for dark in (False, True):
+        for status in STATUSES:
+            direct = _render(width, height, status, dark, cached=False)
+            cached = _render(width, height, status, dark, cached=True)
+            if direct == cached:
+                continue
+            for y in range(height):
+                for x in range(width):
+                    a, b = direct.pixelColor(x, y), cached.pixelColor(x, y)
+                    if a != b:
+                        differences += 1
+                        largest = max(
+                            largest,
+                            abs(a.red() - b.red()),
+                            abs(a.green() - b.green()),
+                            abs(a.blue() - b.blue()),
+                        )
+    return differences, largest
+
+
+def _direct_paint(self, event):
+    # So hat FluentCard vor dem Zwischenspeicher gezeichnet
+    painter = QPainter(self)
+    gui.paint_card_background(painter, self.width(), self.height(), self.status, gui.is_dark_theme())
+
+
+def scroll(orders: int, frames: int) -> float:
+    """Scrollt eine Kartenliste einmal von oben nach unten und zeichnet jedes Bild neu
+
+    Returns:
+        float: Durchschnittliche Dauer pro Bild in Sekunden
+    """
+    window = gui.CardList(main_window=None)
+    window.resize(800, 600)
+    window.sync([FotoparadiesStatus(9, 1000 + i, fetch_data=False) for i in range(orders)])
+    window.show()
+    QApplication.processEvents()
+
+    bar = window.verticalScrollBar()
+    step = max(bar.maximum() // frames, 1)
+    start = time.perf_counter()
+    for frame in range(frames):
+        bar.setValue(frame * step)
+        window.viewport().repaint()
+    elapsed = time.perf_counter() - start
+    window.close()
+    return elapsed / frames
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orders", type=int, default=300, help="Anzahl der Karten")
+    parser.add_argument("--frames", type=int, default=200, help="Anzahl gezeichneter Bilder")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv[:1])  # noqa: F841
+
+    differences, largest = compare()
+    if largest > 1:
+        print(f"FEHLER: {differences} Pixel weichen um bis zu {largest} Stufen vom direkten Zeichnen ab")
+        return 1
+    print(f"Zwischengespeicherte Hintergründe entsprechen dem direkten Zeichnen "
+          f"({differences} Kantenpixel mit Rundungsabweichung)")
+
+    gui.card_backgrounds.clear()
+    cached = scroll(args.orders, args.frames)
+    cached_paint = gui.FluentCard.paintEvent
+    gui.FluentCard.paintEvent = _direct_paint
+    try:
+        direct = scroll(args.orders, args.frames)
+    finally:
+        gui.FluentCard.paintEvent = cached_paint
+
+    print(f"Scrollen über {args.orders} Karten ({args.frames} Bilder):")
+    print(f"  direkt gezeichnet:     {direct * 1000:.2f} ms pro Bild")
+    print(f"  zwischengespeichert:   {cached * 1000:.2f} ms pro Bild ({direct / cached:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Iterable, Iterator, Optional
+
+from .fotoparadies import FotoparadiesStatus
+
+if TYPE_CHECKING:
+    from .client import FotoparadiesClient
+
+DEFAULT_RATE = 5.0
+DEFAULT_WORKERS = 8
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token-Bucket zur Begrenzung der Anfragen pro Sekunde.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        """Initialisiert den Token-Bucket
+
+        Args:
+            rate (float): Anzahl der Tokens, die pro Sekunde nachgefüllt werden
+            capacity (Optional[float], optional): Maximale Anzahl gespeicherter Tokens (Burst). Standard ist max(1, rate).
+        """
+        if rate <= 0:
+            raise ValueError("rate muss größer als 0 sein")
+
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Entnimmt ein Token und wartet, bis eines verfügbar ist"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._last) * self.rate
+                )
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def iter_refresh(
+    orders: Iterable[FotoparadiesStatus],
+    client: Optional["FotoparadiesClient"] = None,
+    rate: float = DEFAULT_RATE,
+    max_workers: int = DEFAULT_WORKERS,
+    cancel: Optional[threading.Event] = None,
+) -> Iterator[FotoparadiesStatus]:
+    """Aktualisiert mehrere Aufträge parallel und gibt sie in der Reihenfolge zurück,
+    in der ihre Aktualisierung abgeschlossen wurde. Aufträge, die wegen eines offenen
+    Circuit Breakers übersprungen wurden, behalten ihren bisherigen Status.
+
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Die Aufträge, die aktualisiert werden sollen
+        client (Optional[FotoparadiesClient], optional): Client für die Abfragen. Standard ist der geteilte Client.
+        rate (float, optional): Maximale Anzahl Anfragen pro Sekunde. Standard ist 5.
+        max_workers (int, optional): Maximale Anzahl gleichzeitiger Anfragen. Standard ist 8.
+        cancel (Optional[threading.Event], optional): Ist das Event gesetzt, werden noch nicht begonnene Aufträge übersprungen.
+
+    Yields:
+        Iterator[FotoparadiesStatus]: Die aktualisierten Aufträge
+    """
+    if client is None:
+        from .client import get_default_client
+
+        client = get_default_client()
+    bucket = TokenBucket(rate)
+
+    def proceed() -> bool:
+        # Ist die API nach wiederholten Fehlern gesperrt, werden die restlichen Aufträge
+        # übersprungen, statt weitere aussichtslose Anfragen zu stellen
+        return client.available and not (cancel is not None and cancel.is_set())
+
+    def refresh_one(order: FotoparadiesStatus) -> FotoparadiesStatus:
+        # Nur echte Anfragen an die API kosten ein Token, Antworten aus dem Cache nicht
+        if proceed() and not client.is_cached(order._shop, order._order):
+            bucket.acquire()
+        if proceed():
+            order.refresh(client=client)
+        return order
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(refresh_one, order) for order in orders]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def refresh_all(
+    orders: Iterable[FotoparadiesStatus],
+    client: Optional["FotoparadiesClient"] = None,
+    rate: float = DEFAULT_RATE,
+    max_workers: int = DEFAULT_WORKERS,
+) -> list[FotoparadiesStatus]:
+    """Aktualisiert mehrere Aufträge parallel und wartet, bis alle abgeschlossen sind.
+
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Die Aufträge, die aktualisiert werden sollen
+        client (Optional[FotoparadiesClient], optional): Client für die Abfragen. Standard ist der geteilte Client.
+        rate (float, optional): Maximale Anzahl Anfragen pro Sekunde. Standard ist 5.
+        max_workers (int, optional): Maximale Anzahl gleichzeitiger Anfragen. Standard ist 8.
+
+    Returns:
+        list[FotoparadiesStatus]: Die aktualisierten Aufträge in ihrer ursprünglichen Reihenfolge
+    """
+    orders = list(orders)
+    for _ in iter_refresh(orders, client=client, rate=rate, max_workers=max_workers):
+        pass
+    return orders
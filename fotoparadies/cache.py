@@ -0,0 +1,155 @@
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Union
+
+from platformdirs import user_cache_dir
+
+from .locking import atomic_write, file_lock
+
+# Gültigkeitsdauer (in Sekunden) eines zwischengespeicherten Status, abhängig vom Auftragsstatus
+DEFAULT_TTLS = {
+    "DELIVERED": 6 * 60 * 60,  # Abgeschlossene Aufträge ändern sich nicht mehr
+    "READY": 15 * 60,
+}
+DEFAULT_TTL = 5 * 60
+NEGATIVE_TTL = 10 * 60
+
+CacheKey = tuple[int, int, int]
+Payload = dict[str, Union[str, int, float, None]]
+
+
+def default_cache_path() -> Path:
+    """Gibt den Pfad zurück, an dem der Antwort-Cache abgelegt wird.
+    Der Pfad ist abhängig vom Betriebssystem. Der Ordner wird angelegt, falls er nicht existiert.
+
+    Returns:
+        Path: Der Pfad der Cache-Datei
+    """
+    cache_path = Path(user_cache_dir(appname="fotoparadies-status", appauthor="hija"))
+    cache_path.mkdir(parents=True, exist_ok=True)
+    return cache_path / "responses.json"
+
+
+class ResponseCache:
+    """
+    Zwischenspeicher für Antworten der Fotoparadies API mit statusabhängiger Gültigkeitsdauer.
+
+    Unbekannte oder ungültige Aufträge werden als negativer Eintrag (``None``) gespeichert,
+    damit sie nicht bei jeder Aktualisierung erneut abgefragt werden.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        path: Optional[Path] = None,
+    ) -> None:
+        """Initialisiert den Cache
+
+        Args:
+            ttls (Optional[dict[str, float]], optional): Gültigkeitsdauer je summaryStateCode. Standard ist DEFAULT_TTLS.
+            default_ttl (float, optional): Gültigkeitsdauer für alle anderen Stati. Standard ist 5 Minuten.
+            negative_ttl (float, optional): Gültigkeitsdauer für unbekannte Aufträge. Standard ist 10 Minuten.
+            path (Optional[Path], optional): Datei, in der der Cache dauerhaft abgelegt wird. Standard ist nur im Speicher.
+        """
+        self.ttls = DEFAULT_TTLS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.negative_ttl = negative_ttl
+        self.path = path
+
+        self._entries: dict[CacheKey, tuple[float, Optional[Payload]]] = {}
+        self._loaded = path is None
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _ttl_for(self, payload: Optional[Payload]) -> float:
+        if payload is None:
+            return self.negative_ttl
+        return self.ttls.get(payload.get("summaryStateCode"), self.default_ttl)
+
+    def _read_file(self) -> dict[CacheKey, tuple[float, Optional[Payload]]]:
+        """Liest die noch gültigen Einträge aus der Cache-Datei.
+        Da die Datei nur atomar ersetzt wird, ist zum Lesen keine Sperre nötig.
+
+        Returns:
+            dict[CacheKey, tuple[float, Optional[Payload]]]: Ablaufzeitpunkt und Antwort je Schlüssel
+        """
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                raw = json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+        now = time.time()
+        entries = {}
+        for key, (expires, payload) in raw.items():
+            if expires > now:
+                shop, order, config = (int(part) for part in key.split(":"))
+                entries[(shop, order, config)] = (expires, payload)
+        return entries
+
+    def _load(self):
+        """Liest die Einträge aus der Cache-Datei ein (nur beim ersten Zugriff)"""
+        self._loaded = True
+        self._entries.update(self._read_file())
+
+    def lookup(self, key: CacheKey) -> tuple[bool, Optional[Payload]]:
+        """Sucht einen gültigen Eintrag im Cache
+
+        Args:
+            key (CacheKey): (Filialnummer, Auftragsnummer, Abfragekonfiguration)
+
+        Returns:
+            tuple[bool, Optional[Payload]]: Ob ein gültiger Eintrag existiert und die Antwort (None bei negativem Eintrag)
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            entry = self._entries.get(key)
+            if entry is None:
+                return False, None
+            expires, payload = entry
+            if expires <= time.time():
+                del self._entries[key]
+                self._dirty = True
+                return False, None
+            return True, payload
+
+    def put(self, key: CacheKey, payload: Optional[Payload]):
+        """Legt eine Antwort im Cache ab
+
+        Args:
+            key (CacheKey): (Filialnummer, Auftragsnummer, Abfragekonfiguration)
+            payload (Optional[Payload]): Die Antwort der API oder None für einen unbekannten Auftrag
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            self._entries[key] = (time.time() + self._ttl_for(payload), payload)
+            self._dirty = True
+
+    def save(self):
+        """Schreibt geänderte, noch gültige Einträge in die Cache-Datei.
+
+        Einträge, die ein anderer Prozess zwischenzeitlich geschrieben hat, bleiben
+        erhalten. Pro Schlüssel gewinnt der Eintrag, der länger gültig ist.
+        """
+        with self._lock:
+            if self.path is None or not self._dirty:
+                return
+            with file_lock(self.path):
+                merged = self._read_file()
+                for key, entry in self._entries.items():
+                    if key not in merged or merged[key][0] < entry[0]:
+                        merged[key] = entry
+                now = time.time()
+                raw = {
+                    f"{shop}:{order}:{config}": [expires, payload]
+                    for (shop, order, config), (expires, payload) in merged.items()
+                    if expires > now
+                }
+                atomic_write(self.path, json.dumps(raw))
+            self._dirty = False
@@ -0,0 +1,396 @@
+import atexit
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Hashable, Optional, TypeVar, Union
+from urllib.parse import urlsplit
+
+import requests
+
+from .cache import ResponseCache, default_cache_path
+from .metrics import metrics, span
+from .transport import (
+    DEFAULT_BASE_URL,
+    HttpTransport,
+    RecordingTransport,
+    ReplayTransport,
+    Transport,
+)
+
+T = TypeVar("T")
+
+
+class UnknownOrderError(requests.HTTPError):
+    """Die API kennt den Auftrag nicht oder hat die Abfrage als ungültig abgelehnt"""
+
+
+class CircuitOpenError(requests.RequestException):
+    """Die API ist nach wiederholten Fehlern vorübergehend gesperrt"""
+
+
+class CircuitBreaker:
+    """
+    Verfolgt aufeinanderfolgende Fehler eines Hosts.
+
+    Nach ``failure_threshold`` Fehlern in Folge wird der Host gesperrt. Die Sperre
+    wächst mit jedem weiteren Fehler exponentiell (mit Zufallsanteil), bis eine
+    Anfrage wieder erfolgreich ist.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        base_delay: float = 2.0,
+        max_delay: float = 300.0,
+    ) -> None:
+        """Initialisiert den Circuit Breaker
+
+        Args:
+            failure_threshold (int, optional): Anzahl Fehler in Folge, ab der gesperrt wird. Standard ist 3.
+            base_delay (float, optional): Erste Sperrdauer in Sekunden. Standard ist 2.
+            max_delay (float, optional): Maximale Sperrdauer in Sekunden. Standard ist 300.
+        """
+        self.failure_threshold = failure_threshold
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        """Gibt an, ob Anfragen an den Host gerade gesperrt sind
+
+        Returns:
+            bool: True, solange die Sperre aktiv ist
+        """
+        return time.monotonic() < self._open_until
+
+    def record_success(self):
+        """Setzt den Fehlerzähler nach einer erfolgreichen Anfrage zurück"""
+        with self._lock:
+            self.failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self):
+        """Zählt einen Fehler und sperrt den Host, sobald die Schwelle erreicht ist"""
+        with self._lock:
+            self.failures += 1
+            if self.failures < self.failure_threshold:
+                return
+            exponent = self.failures - self.failure_threshold
+            delay = min(self.max_delay, self.base_delay * 2**exponent)
+            # Zufallsanteil, damit nicht alle Clients gleichzeitig wieder anfragen
+            delay = random.uniform(delay / 2, delay)
+            self._open_until = time.monotonic() + delay
+
+
+class SingleFlight:
+    """
+    Fasst gleichzeitige Aufrufe mit demselben Schlüssel zu einem einzigen zusammen.
+
+    Der erste Aufrufer führt die Funktion aus, alle weiteren warten auf dessen
+    Ergebnis (oder Fehler) und erhalten es ebenfalls.
+    """
+
+    class _Call:
+        __slots__ = ("done", "result", "error")
+
+        def __init__(self) -> None:
+            self.done = threading.Event()
+            self.result = None
+            self.error: Optional[BaseException] = None
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, SingleFlight._Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable[[], T]) -> T:
+        """Führt die Funktion aus, sofern nicht bereits ein Aufruf mit demselben Schlüssel läuft
+
+        Args:
+            key (Hashable): Schlüssel, unter dem Aufrufe zusammengefasst werden
+            function (Callable[[], T]): Die auszuführende Funktion
+
+        Returns:
+            T: Das Ergebnis der Funktion
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = SingleFlight._Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class FotoparadiesClient:
+    """
+    Wiederverwendbarer HTTP-Client für die Fotoparadies API.
+
+    Standardmäßig nutzt der Client einen ``HttpTransport`` mit Verbindungspool, sodass
+    mehrere Abfragen dieselben (Keep-Alive) Verbindungen wiederverwenden, statt für
+    jeden Auftrag einen neuen TCP- und TLS-Handshake durchzuführen.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        connect_timeout: float = 3.05,
+        read_timeout: float = 10.0,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache: Optional[ResponseCache] = None,
+        base_url: str = DEFAULT_BASE_URL,
+        transport: Optional[Transport] = None,
+    ) -> None:
+        """Initialisiert den Client
+
+        Args:
+            pool_size (int, optional): Maximale Anzahl offener Verbindungen. Standard ist 10.
+            connect_timeout (float, optional): Timeout für den Verbindungsaufbau in Sekunden. Standard ist 3.05.
+            read_timeout (float, optional): Timeout für das Lesen der Antwort in Sekunden. Standard ist 10.
+            retries (int, optional): Anzahl der Wiederholungsversuche bei Fehlern. Standard ist 3.
+            backoff_factor (float, optional): Faktor für die Wartezeit zwischen Wiederholungen. Standard ist 0.5.
+            cache (Optional[ResponseCache], optional): Cache für die Antworten der API. Standard ist kein Cache.
+            base_url (str, optional): Basis-URL der API für den HTTP-Transport. Standard ist spot.photoprintit.com.
+            transport (Optional[Transport], optional): Eigener Transport, z.B. zum Wiedergeben aufgezeichneter Antworten. Standard ist HTTP.
+        """
+        self.cache = cache
+        self.timeout = (connect_timeout, read_timeout)
+
+        if transport is None:
+            transport = HttpTransport(
+                base_url=base_url,
+                pool_size=pool_size,
+                retries=retries,
+                backoff_factor=backoff_factor,
+            )
+        self.transport = transport
+
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._breakers_lock = threading.Lock()
+        self._inflight = SingleFlight()
+
+    def breaker(self, url: Optional[str] = None) -> CircuitBreaker:
+        """Gibt den Circuit Breaker für den Host einer URL zurück
+
+        Args:
+            url (Optional[str], optional): Die URL. Standard ist die URL des Transports.
+
+        Returns:
+            CircuitBreaker: Der Circuit Breaker des Hosts
+        """
+        host = urlsplit(url or self.transport.url).netloc
+        with self._breakers_lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker()
+            return self._breakers[host]
+
+    @property
+    def available(self) -> bool:
+        """Gibt an, ob die API gerade abgefragt werden darf
+
+        Returns:
+            bool: False, solange der Circuit Breaker der API offen ist
+        """
+        return not self.breaker().is_open
+
+    def is_cached(self, shop: int, order: int, config: int = 1320) -> bool:
+        """Gibt an, ob der Cache eine gültige Antwort für einen Auftrag hat, sodass
+        ``get_status`` keine Anfrage an die API stellt
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+            config (int, optional): Abfragekonfiguration. Standard ist 1320.
+
+        Returns:
+            bool: True, falls die Antwort aus dem Cache kommt
+        """
+        if self.cache is None:
+            return False
+        found, _ = self.cache.lookup((shop, order, config))
+        return found
+
+    def get_status(
+        self, shop: int, order: int, config: int = 1320
+    ) -> dict[str, Union[str, int, float, None]]:
+        """Fragt den Auftragszustand bei der Fotoparadies API ab
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+            config (int, optional): Abfragekonfiguration. Standard ist 1320.
+
+        Raises:
+            UnknownOrderError: Wenn der Auftrag unbekannt oder ungültig ist
+            CircuitOpenError: Wenn die API nach wiederholten Fehlern vorübergehend gesperrt ist
+            requests.RequestException: Wenn die Anfrage fehlschlägt
+            ValueError: Wenn die Antwort kein gültiges JSON enthält
+
+        Returns:
+            dict[str, Union[str, int, float, None]]: Den Auftragszustand.
+        """
+        key = (shop, order, config)
+        if self.cache is not None:
+            found, payload = self.cache.lookup(key)
+            metrics.count("cache_lookups", hit=found)
+            if found:
+                if payload is None:
+                    raise UnknownOrderError(
+                        f"Auftrag {order} in Filiale {shop} ist unbekannt"
+                    )
+                return payload
+
+        # Gleichzeitige Abfragen desselben Auftrags teilen sich eine Anfrage
+        return self._inflight.do(key, lambda: self._fetch(key))
+
+    def _fetch(
+        self, key: tuple[int, int, int]
+    ) -> dict[str, Union[str, int, float, None]]:
+        """Fragt einen Auftrag bei der API ab und legt das Ergebnis im Cache ab
+
+        Args:
+            key (tuple[int, int, int]): (Filialnummer, Auftragsnummer, Abfragekonfiguration)
+
+        Returns:
+            dict[str, Union[str, int, float, None]]: Den Auftragszustand.
+        """
+        shop, order, config = key
+        breaker = self.breaker()
+        if breaker.is_open:
+            raise CircuitOpenError("Die API ist vorübergehend nicht erreichbar")
+
+        parameters = {"config": config, "shop": shop, "order": order}
+        try:
+            with span("api_fetch"):
+                response = self.transport.get(parameters, timeout=self.timeout)
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+        metrics.count("api_responses", status=response.status_code)
+
+        if response.status_code >= 500 or response.status_code == 429:
+            breaker.record_failure()
+            response.raise_for_status()  # Raise an exception for bad status codes
+
+        if response.status_code >= 400:
+            # Client-Fehler bedeuten einen unbekannten oder ungültigen Auftrag und werden
+            # negativ zwischengespeichert, vorübergehende Fehler dagegen nicht
+            breaker.record_success()
+            if self.cache is not None:
+                self.cache.put(key, None)
+            raise UnknownOrderError(
+                f"Auftrag {order} in Filiale {shop} ist unbekannt", response=response
+            )
+
+        try:
+            payload = response.json()
+        except ValueError:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+
+        if self.cache is not None:
+            self.cache.put(key, payload)
+        return payload
+
+    def close(self):
+        """Schreibt den Cache und schließt alle offenen Verbindungen des Pools"""
+        if self.cache is not None:
+            self.cache.save()
+        self.transport.close()
+
+    def __enter__(self) -> "FotoparadiesClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+_default_client: Optional[FotoparadiesClient] = None
+_default_client_lock = threading.Lock()
+
+
+def get_default_client() -> FotoparadiesClient:
+    """Gibt den gemeinsam genutzten Client zurück und legt ihn bei Bedarf an.
+
+    Returns:
+        FotoparadiesClient: Der prozessweit geteilte Client
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is None:
+            _default_client = _create_client(
+                base_url=os.environ.get("FOTOPARADIES_BASE_URL"),
+                replay=os.environ.get("FOTOPARADIES_REPLAY"),
+                record=os.environ.get("FOTOPARADIES_RECORD"),
+            )
+            atexit.register(_default_client.close)
+        return _default_client
+
+
+def configure_default_client(
+    base_url: Optional[str] = None,
+    replay: Optional[Union[str, Path]] = None,
+    record: Optional[Union[str, Path]] = None,
+) -> FotoparadiesClient:
+    """Ersetzt den gemeinsam genutzten Client, z.B. um gegen einen lokalen Ersatzserver
+    oder aufgezeichnete Antworten statt gegen die echte API zu arbeiten.
+
+    Args:
+        base_url (Optional[str], optional): Basis-URL der API. Standard ist spot.photoprintit.com.
+        replay (Optional[Union[str, Path]], optional): Datei mit aufgezeichneten Antworten, die wiedergegeben werden.
+        record (Optional[Union[str, Path]], optional): Datei, in die alle Antworten aufgezeichnet werden.
+
+    Returns:
+        FotoparadiesClient: Der neue, prozessweit geteilte Client
+    """
+    global _default_client
+    with _default_client_lock:
+        if _default_client is not None:
+            atexit.unregister(_default_client.close)
+            _default_client.close()
+        _default_client = _create_client(base_url=base_url, replay=replay, record=record)
+        atexit.register(_default_client.close)
+        return _default_client
+
+
+def _create_client(
+    base_url: Optional[str] = None,
+    replay: Optional[Union[str, Path]] = None,
+    record: Optional[Union[str, Path]] = None,
+) -> FotoparadiesClient:
+    if replay:
+        transport = ReplayTransport(Path(replay))
+    else:
+        transport = HttpTransport(base_url=base_url or DEFAULT_BASE_URL)
+    if record:
+        transport = RecordingTransport(transport, Path(record))
+
+    # Nur Antworten der echten API werden dauerhaft zwischengespeichert, damit sich
+    # Ersatzserver und Aufzeichnungen nicht mit echten Daten vermischen
+    if replay or base_url or record:
+        cache = ResponseCache()
+    else:
+        cache = ResponseCache(path=default_cache_path())
+    return FotoparadiesClient(cache=cache, transport=transport)
@@ -1,35 +1,182 @@
+import sys
 from datetime import datetime
-from sqlite3 import paramstyle
-from typing import Union
+from typing import TYPE_CHECKING, Any, Optional, Union
 
-import requests
+from .metrics import span
+
+if TYPE_CHECKING:
+    from .client import FotoparadiesClient
 
 
 class FotoparadiesStatus:
     """
     Klasse zum Abrufen und Verabeiten des akutellen Auftragstatus von Fotoarbeiten
+
+    Von der API-Antwort werden nur die benötigten Felder behalten. Das Datum wird
+    einmalig eingelesen und der Status als internierter Text abgelegt, sodass sich
+    alle Aufträge mit gleichem Status denselben String teilen.
     """
 
+    __slots__ = (
+        "_shop",
+        "_order",
+        "_name",
+        "_state",
+        "_updated",
+        "_price",
+        "_fetched_at",
+        "_failed_at",
+        "_failures",
+        "_last_error",
+    )
+
     def __init__(
-        self, shop: int, order: int, name: str = None, fetch_data=True
+        self,
+        shop: int,
+        order: int,
+        name: str = None,
+        fetch_data=True,
+        client: Optional["FotoparadiesClient"] = None,
     ) -> None:
         """Initialisiert einen Fotoparadies Status
 
         Args:
             shop (int): Filialnummer
             order (int): Auftragsnummer
+            client (Optional[FotoparadiesClient], optional): Client für die Abfrage. Standard ist der geteilte Client.
         """
 
         self._order = order
         self._shop = shop
         self._name = name
+        self._state = None
+        self._updated = None
+        self._price = None
+        self._fetched_at = None
+        self._failed_at = None
+        self._failures = 0
+        self._last_error = None
 
         if fetch_data:
-            self.refresh()
+            self.refresh(client=client)
+
+    def refresh(self, client: Optional["FotoparadiesClient"] = None):
+        """Aktualisiert die Auftragsdaten mit der Fotoparadies API
+
+        Args:
+            client (Optional[FotoparadiesClient], optional): Client, dessen Verbindungen genutzt werden. Standard ist der geteilte Client.
+        """
+        # Erst hier importiert, damit das Laden gespeicherter Aufträge ohne requests auskommt
+        import requests
+
+        from .client import CircuitOpenError, UnknownOrderError
+
+        try:
+            self._apply_payload(
+                self._get_json_status(shop=self._shop, order=self._order, client=client)
+            )
+        except CircuitOpenError:
+            # Die API ist nach wiederholten Fehlern gesperrt, der Auftrag bleibt unverändert
+            return
+        except UnknownOrderError:
+            # Der Auftrag wurde noch nicht im Großlabor eingescannt. Ein bereits
+            # bekannter Status wird dadurch nicht überschrieben.
+            if self._state is None:
+                self._apply_payload(self._error_status(self._order))
+        except (requests.RequestException, ValueError) as e:
+            # Der Fehler wird neben dem letzten erfolgreichen Status festgehalten,
+            # statt ihn zu ersetzen
+            self._failures += 1
+            self._failed_at = datetime.now()
+            self._last_error = str(e) or type(e).__name__
+            if self._state is None:
+                self._apply_payload(self._error_status(self._order))
+            return
+
+        self._fetched_at = datetime.now()
+        self._failures = 0
+        self._failed_at = None
+        self._last_error = None
+
+    def _apply_payload(self, payload: dict[str, Union[str, int, float, None]]):
+        """Übernimmt die benötigten Felder aus einer Antwort der API
+
+        Args:
+            payload (dict[str, Union[str, int, float, None]]): Die Antwort der API
+        """
+        state = payload.get("summaryStateCode")
+        self._state = sys.intern(str(state)) if state is not None else None
+        self._updated = parse_summary_date(payload.get("summaryDate"))
+        self._price = payload.get("summaryPriceText")
+
+    def __getstate__(self) -> tuple:
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state: Union[tuple, dict[str, Any]]):
+        if isinstance(state, dict):
+            state = self._convert_legacy_state(state)
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+        if self._state is not None:
+            self._state = sys.intern(self._state)
+
+    @classmethod
+    def _convert_legacy_state(cls, state: dict[str, Any]) -> tuple:
+        """Wandelt den Zustand eines älteren, gepickelten Auftrags (mit ``_statusjson``)
+        in die kompakte Darstellung um
+
+        Args:
+            state (dict[str, Any]): Das ``__dict__`` des alten Objekts
+
+        Returns:
+            tuple: Der Zustand in der Reihenfolge von ``__slots__``
+        """
+        converted = cls(
+            state["_shop"], state["_order"], state.get("_name"), fetch_data=False
+        )
+        if state.get("_statusjson"):
+            converted._apply_payload(state["_statusjson"])
+        converted._fetched_at = state.get("_fetched_at")
+        converted._failed_at = state.get("_failed_at")
+        converted._failures = state.get("_failures", 0)
+        converted._last_error = state.get("_last_error")
+        return converted.__getstate__()
+
+    @property
+    def fetched_at(self) -> Optional[datetime]:
+        """Zeitpunkt der letzten Abfrage bei der API
+
+        Returns:
+            Optional[datetime]: Letzte Abfrage oder None, falls der Auftrag noch nie abgefragt wurde
+        """
+        return self._fetched_at
+
+    @property
+    def failed_at(self) -> Optional[datetime]:
+        """Zeitpunkt der letzten fehlgeschlagenen Abfrage
+
+        Returns:
+            Optional[datetime]: Letzter Fehler oder None, falls die letzte Abfrage erfolgreich war
+        """
+        return self._failed_at
+
+    @property
+    def failures(self) -> int:
+        """Anzahl der fehlgeschlagenen Abfragen seit der letzten erfolgreichen
+
+        Returns:
+            int: Anzahl Fehler in Folge
+        """
+        return self._failures
+
+    @property
+    def last_error(self) -> Optional[str]:
+        """Fehlermeldung der letzten fehlgeschlagenen Abfrage
 
-    def refresh(self):
-        """Aktualisiert die Auftragsdaten mit der Fotoparadies API"""
-        self._statusjson = self._get_json_status(shop=self._shop, order=self._order)
+        Returns:
+            Optional[str]: Fehlermeldung oder None, falls die letzte Abfrage erfolgreich war
+        """
+        return self._last_error
 
     @property
     def ordername(self) -> str:
@@ -47,38 +194,56 @@ class FotoparadiesStatus:
         Returns:
             int: Auftragsnummer
         """
-        return self._statusjson["orderNo"]
+        return self._order
 
     @property
-    def currentstatus(self) -> str:
+    def currentstatus(self) -> Optional[str]:
         """Aktueller Status als Kurztext
 
         Returns:
-            str: Status (Kurz)
+            Optional[str]: Status (Kurz) oder None, falls der Auftrag noch nie abgefragt wurde
         """
-        return self._statusjson["summaryStateCode"]
+        return self._state
 
     @property
-    def getlastupdate(self) -> datetime:
+    def getlastupdate(self) -> Optional[datetime]:
         """Zeitpunkt des letzten Updates
 
         Returns:
-            datetime: Letztes Update
+            Optional[datetime]: Letztes Update oder None, falls es nicht bekannt ist
         """
-        return self._statusjson["summaryDate"]
+        return self._updated
 
     @property
-    def price(self) -> str:
+    def price(self) -> Optional[str]:
         """Preis für den Auftrag
 
         Returns:
-            float: Auftragspreis
+            Optional[str]: Auftragspreis
+        """
+        return self._price
+
+    def as_dict(self) -> dict[str, Union[str, int, None]]:
+        """Gibt die Auftragsdaten als JSON-taugliches Dictionary zurück
+
+        Returns:
+            dict[str, Union[str, int, None]]: Filiale, Auftrag, Name, Status, letztes Update und Preis
         """
-        return self._statusjson["summaryPriceText"]
+        return {
+            "shop": self._shop,
+            "order": self._order,
+            "name": self.ordername,
+            "state": self._state,
+            "updated": self._updated.isoformat() if self._updated else None,
+            "price": self._price,
+        }
 
     @staticmethod
     def _get_json_status(
-        shop: int, order: int, config: int = 1320
+        shop: int,
+        order: int,
+        config: int = 1320,
+        client: Optional["FotoparadiesClient"] = None,
     ) -> dict[str, Union[str, int, float, None]]:
         """Gibt den aktuellen Status des Auftragstatus zurück
 
@@ -86,21 +251,57 @@ class FotoparadiesStatus:
             shop (int): Filialnummer
             order (int): Auftragsnummer
             config (int, optional): Abfragekonfiguration. Standard ist 1320.
+            client (Optional[FotoparadiesClient], optional): Client für die Abfrage. Standard ist der geteilte Client.
+
+        Raises:
+            UnknownOrderError: Wenn der Auftrag unbekannt oder ungültig ist
+            CircuitOpenError: Wenn die API nach wiederholten Fehlern vorübergehend gesperrt ist
+            requests.RequestException: Wenn die Anfrage fehlschlägt
+            ValueError: Wenn die Antwort kein gültiges JSON enthält
 
         Returns:
             dict[str, Union[str, int, float, None]]: Den Auftragszustand.
         """
-        requesturl = f"https://spot.photoprintit.com/spotapi/orderInfo/forShop"
-        parameters = {"config": config, "shop": shop, "order": order}
-        try:
-            request = requests.get(requesturl, params=parameters)
-            request.raise_for_status()  # Raise an exception for bad status codes
-            return request.json()
-        except (requests.RequestException, ValueError) as e:
-            # Return a default status if the request fails
-            return {
-                "orderNo": order,
-                "summaryStateCode": "ERROR",
-                "summaryDate": datetime.now().isoformat(),
-                "summaryPriceText": "N/A"
-            }
+        if client is None:
+            from .client import get_default_client
+
+            client = get_default_client()
+        with span("get_json_status"):
+            return client.get_status(shop=shop, order=order, config=config)
+
+    @staticmethod
+    def _error_status(order: int) -> dict[str, Union[str, int, float, None]]:
+        """Gibt einen Ersatzstatus für Aufträge zurück, zu denen es keine Daten gibt
+
+        Args:
+            order (int): Auftragsnummer
+
+        Returns:
+            dict[str, Union[str, int, float, None]]: Den Auftragszustand ERROR.
+        """
+        return {
+            "orderNo": order,
+            "summaryStateCode": "ERROR",
+            "summaryDate": datetime.now().isoformat(),
+            "summaryPriceText": "N/A",
+        }
+
+
+def parse_summary_date(value: Optional[str]) -> Optional[datetime]:
+    """Liest ein Datum der API (ISO 8601) als lokale datetime ohne Zeitzone ein
+
+    Args:
+        value (Optional[str]): Das Datum als Text
+
+    Returns:
+        Optional[datetime]: Das Datum oder None, falls es nicht gelesen werden kann
+    """
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
@@ -1,16 +1,189 @@
 import sys
 import json
+import argparse
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QPushButton, QLabel, QLineEdit, QMessageBox,
                            QScrollArea, QFrame, QSizePolicy, QStyle, QStyleFactory,
-                           QComboBox, QInputDialog, QDialog, QListWidget, QListWidgetItem)
-from PyQt6.QtCore import QTimer, Qt, QRect, QRectF, QSize, QUrl
-from PyQt6.QtGui import QFont, QColor, QPalette, QPainter, QPainterPath, QIcon, QLinearGradient
+                           QComboBox, QInputDialog, QDialog, QListWidget, QListWidgetItem,
+                           QProgressBar, QListView, QAbstractItemView, QStyledItemDelegate)
+from PyQt6.QtCore import (QTimer, Qt, QRect, QRectF, QSize, QUrl, QObject, QRunnable,
+                          QThreadPool, pyqtSignal, QAbstractListModel, QModelIndex, QEvent)
+from PyQt6.QtGui import (QFont, QColor, QPalette, QPainter, QPainterPath, QIcon, QLinearGradient,
+                         QFontMetrics, QPixmap)
 from PyQt6.QtGui import QDesktopServices
 from platformdirs import user_data_dir
-from fotoparadies.main import get_orders_list, save_orders_list
+from fotoparadies.repository import OrderRepository
+from fotoparadies.locking import atomic_write, file_lock
 from fotoparadies.fotoparadies import FotoparadiesStatus
+from fotoparadies.client import configure_default_client, get_default_client
+from fotoparadies.batch import iter_refresh
+from fotoparadies.scheduler import due_orders, seconds_until_next_due
+from fotoparadies.metrics import enable_profiling, span
+from fotoparadies.theme import THEMES, cards_stylesheet, controls_stylesheet, detect_theme, theme_palette
+
+# Ab so vielen Aufträgen wird statt einzelner Karten die virtualisierte Liste genutzt
+VIRTUAL_LIST_THRESHOLD = 200
+STATUS_URL = "https://www.fotoparadies.de/service/auftragsstatus.html#/?orderid={order}&locationid={shop}"
+
+
+def order_url(order):
+    """Gibt die Adresse der Statusseite eines Auftrags auf fotoparadies.de zurück"""
+    return QUrl(STATUS_URL.format(order=order._order, shop=order._shop))
+
+
+def status_icon(status):
+    """Gibt Icon (Emoji) und Textfarbe für einen Status zurück"""
+    if status == "READY":
+        return "✅", "#107C10"  # Grüner Haken, Grün
+    if status == "DELIVERED":
+        return "📦", "#0078D4"  # Paket, Blau
+    return "⏳", "#797775"  # Sanduhr, Grau
+
+
+def is_dark_theme():
+    """Erkennt anhand der Palette, ob das System ein dunkles Farbschema nutzt"""
+    return detect_theme(QApplication.palette()).dark
+
+
+def status_accent(status):
+    """Gibt die Akzentfarbe einer Karte für einen Status zurück (Windows 11 Fluent Farben)"""
+    if status == "ERROR":
+        return "#FD8183"  # Fluent Error Red
+    if status == "DELIVERED":
+        return "#60CDAE"  # Fluent Success Green
+    if status == "READY":
+        return "#60A5FA"  # Fluent Info Blue
+    return "#FDB022"  # Fluent Warning Orange
+
+
+def paint_card_background(painter, width, height, status, dark):
+    """Zeichnet den Hintergrund einer Karte im Fluent-Design: Fläche, Statusakzent,
+    Schimmer und Rahmen. Wird von FluentCard und OrderItemDelegate genutzt."""
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+
+    # Basis-Rechteck
+    path = QPainterPath()
+    rect = QRectF(2, 2, width-4, height-4)
+    path.addRoundedRect(rect, 8, 8)  # Größerer Radius für Fluent Design
+    
+    # Status-spezifische Farben
+    status_color = QColor(status_accent(status))
+    
+    # Hintergrund und Effekte basierend auf System-Theme
+    if not dark:
+        # Light Mode
+        bg_color = QColor(255, 255, 255)
+        if status:
+            # Mica-Effekt (Layer 1)
+            painter.fillPath(path, QColor(255, 255, 255, 240))
+            
+            # Status-Akzent (Layer 2)
+            accent_path = QPainterPath()
+            accent_rect = QRectF(2, 2, 4, height-4)
+            accent_path.addRoundedRect(accent_rect, 2, 2)
+            painter.fillPath(accent_path, status_color)
+            
+            # Subtle Glow (Layer 3)
+            glow = QLinearGradient(0, 0, 8, 0)
+            glow_color = QColor(status_color)
+            glow_color.setAlpha(15)
+            glow.setColorAt(0, glow_color)
+            glow.setColorAt(1, QColor(255, 255, 255, 0))
+            painter.fillRect(6, 2, 8, height-4, glow)
+        else:
+            painter.fillPath(path, QColor(255, 255, 255, 240))
+        
+        # Border
+        painter.setPen(QColor(0, 0, 0, 15))
+    else:
+        # Dark Mode
+        bg_color = QColor(45, 45, 45)
+        if status:
+            # Mica-Effekt (Layer 1)
+            painter.fillPath(path, QColor(45, 45, 45, 240))
+            
+            # Status-Akzent (Layer 2)
+            accent_path = QPainterPath()
+            accent_rect = QRectF(2, 2, 4, height-4)
+            accent_path.addRoundedRect(accent_rect, 2, 2)
+            painter.fillPath(accent_path, status_color)
+            
+            # Subtle Glow (Layer 3)
+            glow = QLinearGradient(0, 0, 8, 0)
+            glow_color = QColor(status_color)
+            glow_color.setAlpha(20)
+            glow.setColorAt(0, glow_color)
+            glow.setColorAt(1, QColor(45, 45, 45, 0))
+            painter.fillRect(6, 2, 8, height-4, glow)
+        else:
+            painter.fillPath(path, QColor(45, 45, 45, 240))
+        
+        # Border
+        painter.setPen(QColor(255, 255, 255, 15))
+    
+    painter.drawPath(path)
+
+
+class CardBackgroundCache:
+    """
+    Zwischenspeicher für gezeichnete Kartenhintergründe je Größe, Status und Farbschema.
+
+    Pfade und Verläufe einer Karte werden so nur einmal gezeichnet, danach wird die
+    fertige Pixmap kopiert. Die Karten einer Liste sind gleich groß, es genügen daher
+    wenige Einträge: Nach einer Größenänderung fallen die ältesten Größen heraus, beim
+    Wechsel des Farbschemas wird alles verworfen.
+    """
+    MAX_ENTRIES = 16
+
+    def __init__(self):
+        self.pixmaps = OrderedDict()
+        self._dark = None
+
+    @property
+    def dark(self):
+        """Farbschema der gespeicherten Hintergründe, die Palette wird nur einmal abgefragt"""
+        if self._dark is None:
+            self._dark = is_dark_theme()
+        return self._dark
+
+    def set_dark(self, dark):
+        """Setzt das Farbschema und verwirft bei einem Wechsel alle Hintergründe"""
+        if dark != self._dark:
+            self.pixmaps.clear()
+            self._dark = dark
+
+    def clear(self):
+        self.pixmaps.clear()
+        self._dark = None
+
+    def pixmap(self, width, height, status, ratio=1.0):
+        """Gibt den Hintergrund einer Karte zurück und zeichnet ihn bei Bedarf"""
+        # Alle Status ohne eigene Farbe sehen gleich aus und teilen sich einen Eintrag
+        key = (width, height, status_accent(status) if status else None, self.dark, ratio)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pixmap)
+        paint_card_background(painter, width, height, status, self.dark)
+        painter.end()
+
+        self.pixmaps[key] = pixmap
+        while len(self.pixmaps) > self.MAX_ENTRIES:
+            self.pixmaps.popitem(last=False)
+        return pixmap
+
+
+# Gemeinsamer Zwischenspeicher aller Karten und der virtualisierten Liste
+card_backgrounds = CardBackgroundCache()
+
 
 class FluentCard(QFrame):
     def __init__(self, status=None):
@@ -20,76 +193,8 @@ class FluentCard(QFrame):
 
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-        # Basis-Rechteck
-        path = QPainterPath()
-        rect = QRectF(2, 2, self.width()-4, self.height()-4)
-        path.addRoundedRect(rect, 8, 8)  # Größerer Radius für Fluent Design
-        
-        # Status-spezifische Farben (Windows 11 Fluent Farben)
-        if self.status == "ERROR":
-            status_color = QColor("#FD8183")  # Fluent Error Red
-        elif self.status == "DELIVERED":
-            status_color = QColor("#60CDAE")  # Fluent Success Green
-        elif self.status == "READY":
-            status_color = QColor("#60A5FA")  # Fluent Info Blue
-        else:
-            status_color = QColor("#FDB022")  # Fluent Warning Orange
-        
-        # Hintergrund und Effekte basierend auf System-Theme
-        if QApplication.palette().window().color().lightness() > 128:
-            # Light Mode
-            bg_color = QColor(255, 255, 255)
-            if self.status:
-                # Mica-Effekt (Layer 1)
-                painter.fillPath(path, QColor(255, 255, 255, 240))
-                
-                # Status-Akzent (Layer 2)
-                accent_path = QPainterPath()
-                accent_rect = QRectF(2, 2, 4, self.height()-4)
-                accent_path.addRoundedRect(accent_rect, 2, 2)
-                painter.fillPath(accent_path, status_color)
-                
-                # Subtle Glow (Layer 3)
-                glow = QLinearGradient(0, 0, 8, 0)
-                glow_color = status_color
-                glow_color.setAlpha(15)
-                glow.setColorAt(0, glow_color)
-                glow.setColorAt(1, QColor(255, 255, 255, 0))
-                painter.fillRect(6, 2, 8, self.height()-4, glow)
-            else:
-                painter.fillPath(path, QColor(255, 255, 255, 240))
-            
-            # Border
-            painter.setPen(QColor(0, 0, 0, 15))
-        else:
-            # Dark Mode
-            bg_color = QColor(45, 45, 45)
-            if self.status:
-                # Mica-Effekt (Layer 1)
-                painter.fillPath(path, QColor(45, 45, 45, 240))
-                
-                # Status-Akzent (Layer 2)
-                accent_path = QPainterPath()
-                accent_rect = QRectF(2, 2, 4, self.height()-4)
-                accent_path.addRoundedRect(accent_rect, 2, 2)
-                painter.fillPath(accent_path, status_color)
-                
-                # Subtle Glow (Layer 3)
-                glow = QLinearGradient(0, 0, 8, 0)
-                glow_color = status_color
-                glow_color.setAlpha(20)
-                glow.setColorAt(0, glow_color)
-                glow.setColorAt(1, QColor(45, 45, 45, 0))
-                painter.fillRect(6, 2, 8, self.height()-4, glow)
-            else:
-                painter.fillPath(path, QColor(45, 45, 45, 240))
-            
-            # Border
-            painter.setPen(QColor(255, 255, 255, 15))
-        
-        painter.drawPath(path)
+        pixmap = card_backgrounds.pixmap(self.width(), self.height(), self.status, self.devicePixelRatioF())
+        painter.drawPixmap(0, 0, pixmap)
 
 class OrderCard(FluentCard):
     def __init__(self, order, main_window=None):
@@ -104,8 +209,7 @@ class OrderCard(FluentCard):
     def mousePressEvent(self, event):
         """Öffnet die Fotoparadies-Website mit den korrekten Parametern"""
         if event.button() == Qt.MouseButton.LeftButton:
-            url = f"https://www.fotoparadies.de/service/auftragsstatus.html#/?orderid={self.order._order}&locationid={self.order._shop}"
-            QDesktopServices.openUrl(QUrl(url))
+            QDesktopServices.openUrl(order_url(self.order))
     
     def setup_ui(self):
         layout = QHBoxLayout(self)
@@ -113,18 +217,9 @@ class OrderCard(FluentCard):
         layout.setSpacing(15)
         
         # Status Icon (Emoji)
-        icon_label = QLabel()
-        if self.order.currentstatus == "READY":
-            icon_label.setText("✅")  # Grüner Haken
-            status_color = "#107C10"  # Grün
-        elif self.order.currentstatus == "DELIVERED":
-            icon_label.setText("📦")  # Paket
-            status_color = "#0078D4"  # Blau
-        else:
-            icon_label.setText("⏳")  # Sanduhr
-            status_color = "#797775"  # Grau
-        icon_label.setFont(QFont("Segoe UI Emoji", 16))
-        layout.addWidget(icon_label)
+        self.icon_label = QLabel()
+        self.icon_label.setFont(QFont("Segoe UI Emoji", 16))
+        layout.addWidget(self.icon_label)
         
         # Info Container
         info_container = QWidget()
@@ -155,18 +250,17 @@ class OrderCard(FluentCard):
         status_layout.setContentsMargins(0, 0, 0, 0)
         status_layout.setSpacing(5)
         
-        status_label = QLabel(self.order.currentstatus)
-        status_label.setFont(QFont("Segoe UI", 11))
-        status_label.setStyleSheet(f"color: {status_color};")
-        status_layout.addWidget(status_label)
+        self.status_label = QLabel()
+        self.status_label.setFont(QFont("Segoe UI", 11))
+        status_layout.addWidget(self.status_label)
         
         # Browser Emoji zum Öffnen der Website
         browser_button = QPushButton("🌐")
         browser_button.setFont(QFont("Segoe UI", 11))
         browser_button.setCursor(Qt.CursorShape.PointingHandCursor)
         browser_button.setToolTip("Website öffnen")
-        browser_button.setStyleSheet("QPushButton { border: none; background: transparent; padding: 0px; }")
-        browser_button.clicked.connect(lambda: QDesktopServices.openUrl(QUrl(f"https://www.fotoparadies.de/service/auftragsstatus.html#/?orderid={self.order._order}&locationid={self.order._shop}")))
+        browser_button.setObjectName("browserButton")
+        browser_button.clicked.connect(lambda: QDesktopServices.openUrl(order_url(self.order)))
         status_layout.addWidget(browser_button)
         
         status_layout.addStretch()
@@ -181,6 +275,346 @@ class OrderCard(FluentCard):
         delete_button.setObjectName("deleteButton")  # Spezielles Styling für Löschen-Button
         delete_button.clicked.connect(lambda: self.main_window.remove_order(self.order))
         layout.addWidget(delete_button)
+        
+        self.apply_status()
+    
+    def apply_status(self):
+        """Überträgt den Status des Auftrags auf Icon, Statustext und Akzentfarbe"""
+        icon, status_color = status_icon(self.status)
+        self.icon_label.setText(icon)
+        self.status_label.setText(self.status or "")
+        # Farbe über die Palette statt eines eigenen Stylesheets je Karte
+        palette = QPalette()
+        palette.setColor(QPalette.ColorRole.WindowText, QColor(status_color))
+        self.status_label.setPalette(palette)
+    
+    def update_order(self, order):
+        """Übernimmt einen aktualisierten Auftrag. Nur bei geändertem Status werden
+        Beschriftungen und Akzent neu gesetzt, sonst bleibt die Karte unberührt."""
+        self.order = order
+        if order.currentstatus != self.status:
+            self.status = order.currentstatus
+            self.apply_status()
+            self.update()
+
+class CardList(QScrollArea):
+    """Auftragsliste aus einzelnen OrderCard-Widgets, für überschaubare Auftragszahlen.
+
+    Die Karten liegen in einem Dict je (Filiale, Auftragsnummer), damit bei Änderungen
+    nur die betroffenen Karten angepasst werden."""
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.main_window = main_window
+        self.setWidgetResizable(True)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.cards = {}
+
+        self.cards_widget = QWidget()
+        self.cards_layout = QVBoxLayout(self.cards_widget)
+        self.cards_layout.setContentsMargins(0, 0, 0, 0)
+        self.cards_layout.setSpacing(8)
+        # Platzhalter am Ende, die Karten werden davor eingefügt
+        self.cards_layout.addStretch()
+        self.setWidget(self.cards_widget)
+
+    def sync(self, orders):
+        """Gleicht die Karten mit den Aufträgen ab: Neue Karten werden eingefügt,
+        gelöschte entfernt und bestehende nur bei geändertem Status angepasst"""
+        keys = {(order._shop, order._order) for order in orders}
+        for key in [key for key in self.cards if key not in keys]:
+            self.remove(key)
+
+        for index, order in enumerate(orders):
+            key = (order._shop, order._order)
+            card = self.cards.get(key)
+            if card is None:
+                card = OrderCard(order, main_window=self.main_window)
+                self.cards[key] = card
+                self.cards_layout.insertWidget(index, card)
+                continue
+            card.update_order(order)
+            if self.cards_layout.indexOf(card) != index:
+                self.cards_layout.removeWidget(card)
+                self.cards_layout.insertWidget(index, card)
+
+    def apply_theme(self, theme):
+        """Setzt das Stylesheet der Kartenschaltflächen für ein Farbschema"""
+        self.setStyleSheet(cards_stylesheet(theme))
+
+    def add(self, order):
+        """Hängt die Karte eines neuen Auftrags an"""
+        key = (order._shop, order._order)
+        if key in self.cards:
+            return
+        card = OrderCard(order, main_window=self.main_window)
+        self.cards[key] = card
+        # Vor dem Platzhalter am Ende einfügen
+        self.cards_layout.insertWidget(self.cards_layout.count() - 1, card)
+
+    def update_order(self, order):
+        """Aktualisiert die Karte eines Auftrags"""
+        card = self.cards.get((order._shop, order._order))
+        if card is not None:
+            card.update_order(order)
+
+    def remove(self, key):
+        """Entfernt die Karte eines Auftrags"""
+        card = self.cards.pop(key, None)
+        if card is not None:
+            self.cards_layout.removeWidget(card)
+            card.deleteLater()
+
+    def remove_many(self, keys):
+        """Entfernt die Karten mehrerer Aufträge"""
+        for key in keys:
+            self.remove(key)
+
+
+class OrderListModel(QAbstractListModel):
+    """Listenmodell der Aufträge für die virtualisierte Ansicht"""
+    OrderRole = Qt.ItemDataRole.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.orders = []
+        self.rows = {}  # (Filiale, Auftragsnummer) -> Zeile
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.orders)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        order = self.orders[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return order.ordername
+        if role == self.OrderRole:
+            return order
+        return None
+
+    def _reindex(self):
+        self.rows = {(order._shop, order._order): row for row, order in enumerate(self.orders)}
+
+    def set_orders(self, orders):
+        """Übernimmt die Aufträge. Bleiben die Aufträge gleich, werden nur die Zeilen
+        neu gezeichnet, sonst wird das Modell zurückgesetzt."""
+        keys = [(order._shop, order._order) for order in orders]
+        if keys == [(order._shop, order._order) for order in self.orders]:
+            self.orders = list(orders)
+            if self.orders:
+                self.dataChanged.emit(self.index(0), self.index(len(self.orders) - 1))
+            return
+        self.beginResetModel()
+        self.orders = list(orders)
+        self._reindex()
+        self.endResetModel()
+
+    def update_order(self, order):
+        """Zeichnet die Zeile eines aktualisierten Auftrags neu"""
+        row = self.rows.get((order._shop, order._order))
+        if row is not None:
+            self.orders[row] = order
+            self.dataChanged.emit(self.index(row), self.index(row))
+
+    def add(self, order):
+        """Hängt die Zeile eines neuen Auftrags an"""
+        key = (order._shop, order._order)
+        if key in self.rows:
+            return
+        row = len(self.orders)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.orders.append(order)
+        self.rows[key] = row
+        self.endInsertRows()
+
+    def remove_many(self, keys):
+        """Entfernt die Zeilen mehrerer Aufträge, der Index wird nur einmal neu aufgebaut"""
+        # Von hinten nach vorne, damit die übrigen Zeilennummern gültig bleiben
+        rows = sorted((self.rows[key] for key in keys if key in self.rows), reverse=True)
+        for row in rows:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.orders[row]
+            self.endRemoveRows()
+        if rows:
+            self._reindex()
+
+    def remove(self, key):
+        """Entfernt die Zeile eines Auftrags"""
+        self.remove_many([key])
+
+
+class OrderItemDelegate(QStyledItemDelegate):
+    """Zeichnet eine Zeile der virtualisierten Liste im Aussehen einer OrderCard,
+    inklusive Website- und Löschen-Schaltfläche, ohne dafür Widgets anzulegen."""
+    ROW_HEIGHT = 76
+    SPACING = 8
+
+    def __init__(self, main_window, parent=None):
+        super().__init__(parent)
+        self.main_window = main_window
+        self.emoji_font = QFont("Segoe UI Emoji", 16)
+        self.bold_font = QFont("Segoe UI", 11, QFont.Weight.Bold)
+        self.font = QFont("Segoe UI", 11)
+
+    def sizeHint(self, option, index):
+        # Die Breite bestimmt die Liste, Zeilen füllen immer den sichtbaren Bereich
+        return QSize(0, self.ROW_HEIGHT)
+
+    def _areas(self, rect, order):
+        """Berechnet die Bereiche einer Zeile: Karte, Icon, Texte und Schaltflächen"""
+        card = QRect(rect.left(), rect.top(), rect.width(), rect.height() - self.SPACING)
+        metrics = QFontMetrics(self.font)
+        bold_metrics = QFontMetrics(self.bold_font)
+        line_height = metrics.height()
+        text_left = card.left() + 41
+        first_line = card.top() + card.height() // 2 - line_height - 2
+        second_line = card.top() + card.height() // 2 + 3
+
+        shop_text = f"Shop {order._shop}"
+        shop_width = bold_metrics.horizontalAdvance(shop_text)
+        status_width = metrics.horizontalAdvance(order.currentstatus or "")
+        delete_width = metrics.horizontalAdvance("Löschen") + 32
+        return {
+            "card": card,
+            "icon": QRect(card.left() + 7, card.top(), 26, card.height()),
+            "shop": QRect(text_left, first_line, shop_width, line_height),
+            "order": QRect(text_left + shop_width + 10, first_line, metrics.horizontalAdvance(f"#{order._order}") + 2, line_height),
+            "status": QRect(text_left, second_line, status_width, line_height),
+            "browser": QRect(text_left + status_width + 5, second_line, metrics.horizontalAdvance("🌐") + 4, line_height),
+            "delete": QRect(card.right() - 15 - delete_width, card.center().y() - 17, delete_width, 34),
+        }
+
+    def paint(self, painter, option, index):
+        order = index.data(OrderListModel.OrderRole)
+        if order is None:
+            return
+        theme = THEMES[card_backgrounds.dark]
+        areas = self._areas(option.rect, order)
+        card = areas["card"]
+        text_color = QColor(theme.text)
+        icon, status_color = status_icon(order.currentstatus)
+
+        ratio = painter.device().devicePixelRatioF()
+        painter.drawPixmap(card.topLeft(), card_backgrounds.pixmap(card.width(), card.height(), order.currentstatus, ratio))
+
+        painter.save()
+        painter.setFont(self.emoji_font)
+        painter.setPen(text_color)
+        painter.drawText(areas["icon"], Qt.AlignmentFlag.AlignCenter, icon)
+        painter.setFont(self.bold_font)
+        painter.drawText(areas["shop"], Qt.AlignmentFlag.AlignVCenter, f"Shop {order._shop}")
+        painter.setFont(self.font)
+        painter.drawText(areas["order"], Qt.AlignmentFlag.AlignVCenter, f"#{order._order}")
+        painter.setPen(QColor(status_color))
+        painter.drawText(areas["status"], Qt.AlignmentFlag.AlignVCenter, order.currentstatus or "")
+        painter.drawText(areas["browser"], Qt.AlignmentFlag.AlignVCenter, "🌐")
+
+        # Löschen-Schaltfläche wie #deleteButton im Stylesheet
+        delete = QRectF(areas["delete"])
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        if theme.dark:
+            painter.setBrush(QColor(255, 0, 0, 26))
+            painter.setPen(QColor(255, 0, 0, 51))
+        else:
+            painter.setBrush(QColor(255, 0, 0, 13))
+            painter.setPen(QColor(255, 0, 0, 26))
+        painter.drawRoundedRect(delete.adjusted(0.5, 0.5, -0.5, -0.5), 4, 4)
+        painter.setPen(QColor(theme.delete_text))
+        painter.drawText(areas["delete"], Qt.AlignmentFlag.AlignCenter, "Löschen")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() != QEvent.Type.MouseButtonRelease or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        order = index.data(OrderListModel.OrderRole)
+        areas = self._areas(option.rect, order)
+        position = event.position().toPoint()
+        if areas["delete"].contains(position):
+            self.main_window.remove_order(order)
+        elif areas["card"].contains(position):
+            # Die ganze Karte öffnet wie der Website-Knopf die Statusseite
+            QDesktopServices.openUrl(order_url(order))
+        return True
+
+
+class OrderListView(QListView):
+    """Virtualisierte Auftragsliste für viele Aufträge: Gezeichnet werden nur die
+    sichtbaren Zeilen, Speicherbedarf und Layoutzeit wachsen nicht mit der Auftragszahl."""
+
+    def __init__(self, main_window):
+        super().__init__()
+        self.order_model = OrderListModel(self)
+        self.setModel(self.order_model)
+        self.setItemDelegate(OrderItemDelegate(main_window, self))
+        self.setUniformItemSizes(True)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setFrameShape(QFrame.Shape.NoFrame)
+        self.setMouseTracking(True)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        # Hintergrund wie das Fenster statt wie ein Eingabefeld
+        self.viewport().setBackgroundRole(QPalette.ColorRole.Window)
+
+    def apply_theme(self, theme):
+        """Zeichnet die Zeilen im neuen Farbschema, die Farben kommen vom Delegate"""
+        self.viewport().update()
+
+    def sync(self, orders):
+        self.order_model.set_orders(orders)
+
+    def update_order(self, order):
+        self.order_model.update_order(order)
+
+    def add(self, order):
+        self.order_model.add(order)
+
+    def remove(self, key):
+        self.order_model.remove(key)
+
+    def remove_many(self, keys):
+        self.order_model.remove_many(keys)
+
+
+class RefreshSignals(QObject):
+    """Signale einer Aktualisierung, sie werden im UI-Thread zugestellt"""
+    order_refreshed = pyqtSignal(object)
+    finished = pyqtSignal(list, bool)  # Aufträge, abgebrochen
+
+
+class RefreshJob(QRunnable):
+    """Aktualisiert Aufträge in einem Thread des QThreadPool, damit die Oberfläche
+    bedienbar bleibt. Jeder fertige Auftrag wird sofort per Signal gemeldet."""
+
+    def __init__(self, orders, client):
+        super().__init__()
+        self.orders = list(orders)
+        self.client = client
+        self.signals = RefreshSignals()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Bricht die Aktualisierung ab, laufende Anfragen werden noch beendet"""
+        self.cancelled.set()
+
+    def _emit(self, name, *args):
+        try:
+            getattr(self.signals, name).emit(*args)
+        except RuntimeError:
+            # Das Fenster wurde geschlossen, bevor die Anfragen fertig waren, und hat die
+            # Signale mitgenommen. Es interessiert sich niemand mehr für das Ergebnis.
+            self.cancelled.set()
+
+    def run(self):
+        try:
+            with span("gui_refresh"):
+                for order in iter_refresh(self.orders, client=self.client, cancel=self.cancelled):
+                    self._emit("order_refreshed", order)
+        finally:
+            self._emit("finished", self.orders, self.cancelled.is_set())
+
 
 class ManageFavoritesDialog(QDialog):
     def __init__(self, parent=None, favorites=None):
@@ -230,7 +664,7 @@ class ManageFavoritesDialog(QDialog):
             self.list_widget.takeItem(self.list_widget.row(item))
 
 class FotoparadiesGUI(QMainWindow):
-    def __init__(self):
+    def __init__(self, virtual_list=None):
         super().__init__()
         # Windows Fluent Design Style aktivieren
         QApplication.setStyle(QStyleFactory.create("Windows"))
@@ -240,8 +674,29 @@ class FotoparadiesGUI(QMainWindow):
         self.favorites_file.parent.mkdir(parents=True, exist_ok=True)
         self.load_favorites()
         
-        # System-Theme erkennen und anwenden
-        self.update_theme()
+        # Aktuelles Farbschema und Akzentfarbe, gesetzt von update_theme
+        self.theme = None
+        self.accent = None
+        
+        # Gemeinsamer HTTP-Client, damit alle Aktualisierungen den Verbindungspool teilen
+        self.client = get_default_client()
+        # Aufträge bleiben im Speicher und werden nur neu geladen, wenn ein anderer
+        # Prozess die Ablage verändert hat
+        self.repository = OrderRepository()
+        # Laufende Aktualisierung im Hintergrund, None falls gerade keine läuft
+        self.refresh_job = None
+        # Abfragen einzelner, gerade hinzugefügter Aufträge
+        self.order_jobs = set()
+        # Eigener Pool mit mindestens zwei Threads: Der globale hat auf Rechnern mit
+        # einem Kern nur einen, dann würde ein neuer Auftrag erst nach der laufenden
+        # Aktualisierung aller Aufträge abgefragt
+        self.thread_pool = QThreadPool(self)
+        self.thread_pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount()))
+        # Ab VIRTUAL_LIST_THRESHOLD Aufträgen wird die virtualisierte Liste verwendet,
+        # die nur die sichtbaren Zeilen zeichnet
+        if virtual_list is None:
+            virtual_list = len(self.repository.all()) > VIRTUAL_LIST_THRESHOLD
+        self.virtual_list = virtual_list
         
         self.setWindowTitle("Fotoparadies Status Tracker")
         self.setGeometry(100, 100, 800, 600)
@@ -252,16 +707,17 @@ class FotoparadiesGUI(QMainWindow):
         self.favorites = []
         if self.favorites_file.exists():
             try:
-                with open(self.favorites_file, 'r') as f:
-                    self.favorites = json.load(f)
+                with file_lock(self.favorites_file, exclusive=False):
+                    with open(self.favorites_file, 'r') as f:
+                        self.favorites = json.load(f)
             except:
                 self.favorites = []
     
     def save_favorites(self):
         """Speichere Favoriten"""
         try:
-            with open(self.favorites_file, 'w') as f:
-                json.dump(self.favorites, f)
+            with file_lock(self.favorites_file):
+                atomic_write(self.favorites_file, json.dumps(self.favorites))
         except Exception as e:
             QMessageBox.warning(self, "Fehler", f"Favoriten konnten nicht gespeichert werden: {str(e)}")
     
@@ -294,6 +750,7 @@ class FotoparadiesGUI(QMainWindow):
     def manage_favorites(self):
         """Öffne Dialog zum Verwalten der Favoriten"""
         dialog = ManageFavoritesDialog(self, self.favorites)
+        self.apply_theme(dialog)
         if dialog.exec():
             # Übernehme die geänderte Favoritenliste
             self.favorites = dialog.favorites
@@ -376,17 +833,9 @@ class FotoparadiesGUI(QMainWindow):
 
         main_layout.addLayout(input_layout)
 
-        # Scroll-Bereich für Karten
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setFrameShape(QFrame.Shape.NoFrame)
-        
-        self.cards_widget = QWidget()
-        self.cards_layout = QVBoxLayout(self.cards_widget)
-        self.cards_layout.setContentsMargins(0, 0, 0, 0)
-        self.cards_layout.setSpacing(8)
-        scroll.setWidget(self.cards_widget)
-        main_layout.addWidget(scroll)
+        # Liste der Aufträge, als Karten oder virtualisiert
+        self.order_list = OrderListView(self) if self.virtual_list else CardList(self)
+        main_layout.addWidget(self.order_list)
         
         # Button-Leiste
         button_widget = QWidget()
@@ -399,6 +848,20 @@ class FotoparadiesGUI(QMainWindow):
         refresh_button.setCursor(Qt.CursorShape.PointingHandCursor)
         refresh_button.clicked.connect(self.refresh_orders)
         button_layout.addWidget(refresh_button)
+        self.refresh_button = refresh_button
+        
+        # Fortschritt der Aktualisierung, nur sichtbar während sie läuft
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setFormat("%v / %m")
+        self.progress_bar.setVisible(False)
+        button_layout.addWidget(self.progress_bar)
+        
+        self.cancel_button = QPushButton("Abbrechen")
+        self.cancel_button.setFont(QFont("Segoe UI", 11))
+        self.cancel_button.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.cancel_button.clicked.connect(self.cancel_refresh)
+        self.cancel_button.setVisible(False)
+        button_layout.addWidget(self.cancel_button)
         
         cleanup_button = QPushButton("Aufräumen")
         cleanup_button.setFont(QFont("Segoe UI", 11))
@@ -407,155 +870,54 @@ class FotoparadiesGUI(QMainWindow):
         button_layout.addWidget(cleanup_button)
         
         main_layout.addWidget(button_widget)
+        # Bereiche mit Eingabefeldern und Schaltflächen, sie bekommen das Stylesheet
+        self.themed_widgets = [shop_widget, order_widget, button_widget]
         
-        # Timer für automatische Aktualisierung (alle 5 Minuten)
+        # Timer für automatische Aktualisierung, er wird nach jeder Aktualisierung auf
+        # den nächsten fälligen Auftrag gestellt
         self.timer = QTimer()
-        self.timer.timeout.connect(self.refresh_orders)
-        self.timer.start(300000)  # 300000 ms = 5 Minuten
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.refresh_due_orders)
         
-        # Initial orders laden
+        # System-Theme erkennen und anwenden, bevor die Karten angelegt werden
+        self.update_theme()
+        
+        # Gespeicherte Aufträge sofort anzeigen, die Aktualisierung läuft im Hintergrund
+        self.show_orders(self.repository.all())
         self.refresh_orders()
     
     def update_theme(self):
-        """Aktualisiert das Farbschema basierend auf dem System-Theme"""
-        is_dark = QApplication.palette().window().color().lightness() <= 128
-        accent_color = QApplication.palette().highlight().color().name()
-        
-        if is_dark:
-            self.setStyleSheet(f"""
-                QMainWindow, QScrollArea, QWidget {{
-                    background-color: #202020;
-                    color: #FFFFFF;
-                }}
-                QLineEdit, QComboBox {{
-                    padding: 8px;
-                    border: 1px solid #404040;
-                    border-radius: 4px;
-                    background: #2D2D2D;
-                    color: #FFFFFF;
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                    padding-right: 8px;
-                }}
-                QComboBox::down-arrow {{
-                    image: none;
-                    border: none;
-                }}
-                QLineEdit:focus, QComboBox:focus {{
-                    border: 1px solid {accent_color};
-                }}
-                QPushButton {{
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    background: rgba(255, 255, 255, 0.06);
-                    color: #FFFFFF;
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                }}
-                QPushButton:hover {{
-                    background: rgba(255, 255, 255, 0.08);
-                }}
-                QPushButton:pressed {{
-                    background: rgba(255, 255, 255, 0.04);
-                }}
-                QPushButton#primary {{
-                    background: {accent_color};
-                    border: 1px solid {accent_color};
-                }}
-                QPushButton#primary:hover {{
-                    opacity: 0.9;
-                }}
-                QPushButton#primary:pressed {{
-                    opacity: 0.8;
-                }}
-                QLabel {{
-                    color: #FFFFFF;
-                    background: transparent;
-                }}
-                #fluentCard {{
-                    background: transparent;
-                    border: none;
-                }}
-                OrderCard QWidget {{
-                    background: transparent;
-                }}
-                #deleteButton {{
-                    background: rgba(255, 0, 0, 0.1);
-                    border: 1px solid rgba(255, 0, 0, 0.2);
-                    color: #FF99A4;
-                }}
-                #deleteButton:hover {{
-                    background: rgba(255, 0, 0, 0.15);
-                }}
-                #deleteButton:pressed {{
-                    background: rgba(255, 0, 0, 0.08);
-                }}
-            """)
-        else:
-            self.setStyleSheet(f"""
-                QMainWindow {{
-                    background-color: #FFFFFF;
-                }}
-                QLineEdit, QComboBox {{
-                    padding: 8px;
-                    border: 1px solid #E5E5E5;
-                    border-radius: 4px;
-                    background: #FFFFFF;
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                    padding-right: 8px;
-                }}
-                QComboBox::down-arrow {{
-                    image: none;
-                    border: none;
-                }}
-                QLineEdit:focus, QComboBox:focus {{
-                    border: 1px solid {accent_color};
-                }}
-                QPushButton {{
-                    padding: 8px 16px;
-                    border-radius: 4px;
-                    background: rgba(0, 0, 0, 0.03);
-                    color: #000000;
-                    border: 1px solid rgba(0, 0, 0, 0.06);
-                }}
-                QPushButton:hover {{
-                    background: rgba(0, 0, 0, 0.05);
-                }}
-                QPushButton:pressed {{
-                    background: rgba(0, 0, 0, 0.02);
-                }}
-                QPushButton#primary {{
-                    background: {accent_color};
-                    border: 1px solid {accent_color};
-                    color: white;
-                }}
-                QPushButton#primary:hover {{
-                    opacity: 0.9;
-                }}
-                QPushButton#primary:pressed {{
-                    opacity: 0.8;
-                }}
-                #fluentCard {{
-                    background: transparent;
-                    border: none;
-                }}
-                OrderCard QWidget {{
-                    background: transparent;
-                }}
-                #deleteButton {{
-                    background: rgba(255, 0, 0, 0.05);
-                    border: 1px solid rgba(255, 0, 0, 0.1);
-                    color: #C42B1C;
-                }}
-                #deleteButton:hover {{
-                    background: rgba(255, 0, 0, 0.08);
-                }}
-                #deleteButton:pressed {{
-                    background: rgba(255, 0, 0, 0.03);
-                }}
-            """)
+        """Wendet das Farbschema des Systems an. Ändert es sich nicht, passiert nichts,
+        sonst werden nur Palette und die Stylesheets der betroffenen Bereiche getauscht"""
+        palette = QApplication.palette()
+        theme = detect_theme(palette)
+        accent = palette.highlight().color().name()
+        if (theme, accent) == (self.theme, self.accent):
+            return
+        self.theme, self.accent = theme, accent
+        
+        # Gezeichnete Kartenhintergründe des alten Farbschemas verwerfen
+        card_backgrounds.set_dark(theme.dark)
+        # Fenster- und Textfarben erben alle Widgets über die Palette
+        self.setPalette(theme_palette(theme))
+        # Stylesheets nur dort, wo sie gebraucht werden, damit neue Karten nicht gegen
+        # ein fensterweites Stylesheet poliert werden müssen
+        controls = controls_stylesheet(theme, accent)
+        for widget in self.themed_widgets:
+            widget.setStyleSheet(controls)
+        self.order_list.apply_theme(theme)
+    
+    def apply_theme(self, widget):
+        """Überträgt das aktuelle Farbschema auf ein eigenes Fenster, z.B. einen Dialog"""
+        widget.setPalette(theme_palette(self.theme))
+        widget.setStyleSheet(controls_stylesheet(self.theme, self.accent))
+    
+    def event(self, event):
+        # Wechsel zwischen hellem und dunklem Farbschema im laufenden Betrieb übernehmen.
+        # ApplicationPaletteChange landet nicht in changeEvent, daher hier.
+        if event.type() == QEvent.Type.ApplicationPaletteChange and self.theme is not None:
+            self.update_theme()
+        return super().event(event)
     
     def on_favorite_selected(self, text):
         """Wenn eine Shopnummer aus den Favoriten ausgewählt wird"""
@@ -577,27 +939,24 @@ class FotoparadiesGUI(QMainWindow):
             shop_number = int(shop)
             order_number = int(order_number)
             
-            # Erstelle neue Bestellung
-            new_order = FotoparadiesStatus(shop_number, order_number)
-            
             # Prüfen ob Bestellung bereits existiert
-            orders = get_orders_list()
-            for existing in orders:
-                if existing._shop == shop_number and existing._order == order_number:
-                    QMessageBox.warning(
-                        self,
-                        "Bestellung existiert bereits",
-                        "Diese Bestellung wurde bereits hinzugefügt."
-                    )
-                    return
+            if self.repository.get(shop_number, order_number) is not None:
+                QMessageBox.warning(
+                    self,
+                    "Bestellung existiert bereits",
+                    "Diese Bestellung wurde bereits hinzugefügt."
+                )
+                return
             
-            # Bestellung hinzufügen
-            orders.append(new_order)
-            save_orders_list(orders)
+            # Erstelle neue Bestellung und füge sie hinzu, abgefragt wird im Hintergrund
+            new_order = FotoparadiesStatus(shop_number, order_number, fetch_data=False)
+            if not self.repository.add(new_order):
+                return
             
-            # UI aktualisieren
+            # Nur die neue Karte anlegen und nur den neuen Auftrag abfragen
             self.order_input.clear()
-            self.refresh_orders()
+            self.order_list.add(new_order)
+            self.fetch_order(new_order)
             
         except ValueError:
             QMessageBox.warning(
@@ -607,39 +966,133 @@ class FotoparadiesGUI(QMainWindow):
             )
     
     def remove_order(self, order_to_remove):
-        orders = get_orders_list()
-        orders = [order for order in orders if order.ordername != order_to_remove.ordername]
-        save_orders_list(orders)
-        self.refresh_orders()
+        """Löscht einen Auftrag und seine Karte, ohne die übrigen abzufragen"""
+        key = (order_to_remove._shop, order_to_remove._order)
+        self.repository.remove(*key)
+        self.order_list.remove(key)
     
     def refresh_orders(self):
-        # Bestehende Karten entfernen
-        while self.cards_layout.count():
-            child = self.cards_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-        
-        # Neue Karten erstellen
-        orders = get_orders_list()
-        for order in orders:
-            order.refresh()  # Status aktualisieren
-            card = OrderCard(order, main_window=self)
-            self.cards_layout.addWidget(card)
-        
-        # Platzhalter am Ende hinzufügen
-        spacer = QWidget()
-        spacer.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
-        self.cards_layout.addWidget(spacer)
+        """Aktualisiert alle Aufträge im Hintergrund"""
+        self.start_refresh(self.repository.all())
+    
+    def refresh_due_orders(self):
+        """Aktualisiert nur die Aufträge, die laut Zeitplan fällig sind"""
+        orders = self.repository.all()
+        due = due_orders(orders)
+        if due:
+            self.start_refresh(due)
+        else:
+            self.show_orders(orders)
+    
+    def start_refresh(self, orders):
+        """Startet die Aktualisierung der Aufträge im QThreadPool"""
+        if self.refresh_job is not None:
+            # Es läuft bereits eine Aktualisierung, deren Ergebnis abgewartet wird
+            return
+        self.timer.stop()
+        job = RefreshJob(orders, self.client)
+        job.signals.order_refreshed.connect(self.on_order_refreshed)
+        job.signals.finished.connect(self.on_refresh_finished)
+        self.refresh_job = job
+        
+        self.progress_bar.setRange(0, len(job.orders))
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(True)
+        self.cancel_button.setVisible(True)
+        self.cancel_button.setEnabled(True)
+        self.refresh_button.setEnabled(False)
+        self.thread_pool.start(job)
+    
+    def fetch_order(self, order):
+        """Fragt einen einzelnen Auftrag im Hintergrund ab, unabhängig von einer
+        laufenden Aktualisierung aller Aufträge"""
+        job = RefreshJob([order], self.client)
+        job.signals.order_refreshed.connect(self.order_list.update_order)
+        job.signals.finished.connect(
+            lambda orders, cancelled, job=job: self.on_order_fetched(job, orders)
+        )
+        self.order_jobs.add(job)
+        self.thread_pool.start(job)
+    
+    def on_order_fetched(self, job, orders):
+        """Ein einzeln abgefragter Auftrag ist fertig"""
+        self.order_jobs.discard(job)
+        self.repository.save_status(orders)
+        # Der neue Auftrag kann früher fällig sein als alle bisherigen
+        if self.refresh_job is None:
+            self.schedule_next_refresh(self.repository.all())
+    
+    def cancel_refresh(self):
+        """Bricht die laufende Aktualisierung ab"""
+        if self.refresh_job is not None:
+            self.refresh_job.cancel()
+            self.cancel_button.setEnabled(False)
+    
+    def on_order_refreshed(self, order):
+        """Ein Auftrag wurde im Hintergrund aktualisiert"""
+        self.progress_bar.setValue(self.progress_bar.value() + 1)
+        self.order_list.update_order(order)
+    
+    def on_refresh_finished(self, orders, cancelled):
+        """Alle Aufträge einer Aktualisierung sind fertig oder sie wurde abgebrochen"""
+        self.refresh_job = None
+        self.progress_bar.setVisible(False)
+        self.cancel_button.setVisible(False)
+        self.refresh_button.setEnabled(True)
+        self.repository.save_status(orders)
+        self.show_orders(self.repository.all())
+    
+    def closeEvent(self, event):
+        # Laufende Anfragen noch beenden lassen, aber keine neuen mehr beginnen
+        self.cancel_refresh()
+        for job in self.order_jobs:
+            job.cancel()
+        self.thread_pool.waitForDone(5000)
+        super().closeEvent(event)
+    
+    def schedule_next_refresh(self, orders):
+        """Stellt den Timer auf den nächsten fälligen Auftrag"""
+        seconds = seconds_until_next_due(orders)
+        if seconds is None:
+            # Alle Aufträge sind abgeschlossen, es muss nichts mehr abgefragt werden
+            self.timer.stop()
+            return
+        # Mindestens 30 Sekunden warten, höchstens eine Stunde
+        self.timer.start(int(min(max(seconds, 30), 3600) * 1000))
+    
+    def show_orders(self, orders):
+        """Gleicht die angezeigte Liste mit den Aufträgen ab"""
+        with span("gui_build_cards", virtual=self.virtual_list):
+            self.order_list.sync(orders)
+        
+        self.schedule_next_refresh(orders)
     
     def cleanup_orders(self):
-        orders = get_orders_list()
-        # Nur Bestellungen behalten, die nicht den Status "DELIVERED" haben
-        orders = [order for order in orders if order.currentstatus != "DELIVERED"]
-        save_orders_list(orders)
-        self.refresh_orders()
+        # Nur Bestellungen behalten, die nicht den Status "DELIVERED" haben. Entfernt
+        # werden nur deren Karten, abgefragt wird nichts.
+        removed = self.repository.remove_by_state("DELIVERED")
+        self.order_list.remove_many([(order._shop, order._order) for order in removed])
 
 def main():
-    app = QApplication(sys.argv)
-    window = FotoparadiesGUI()
+    # Optional gegen einen Ersatzserver oder aufgezeichnete Antworten arbeiten
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--base-url")
+    parser.add_argument("--replay")
+    parser.add_argument("--record")
+    parser.add_argument("--profile")
+    # Virtualisierte Liste erzwingen, sonst ab VIRTUAL_LIST_THRESHOLD Aufträgen
+    parser.add_argument("--list-view", action="store_true", default=None)
+    args, qt_args = parser.parse_known_args(sys.argv[1:])
+    # Ohne --profile wird die Umgebungsvariable FOTOPARADIES_PROFILE ausgewertet
+    enable_profiling(args.profile)
+    if args.base_url or args.replay or args.record:
+        try:
+            configure_default_client(base_url=args.base_url, replay=args.replay, record=args.record)
+        except (OSError, ValueError) as error:
+            print(f"Aufgezeichnete Antworten können nicht geladen werden: {error}", file=sys.stderr)
+            sys.exit(1)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
+    window = FotoparadiesGUI(virtual_list=args.list_view)
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+from .store import OrderStore, get_default_store
+
+# Verlauf gelöschter Aufträge wird nach dieser Zeit beim Verdichten entfernt
+DEFAULT_RETENTION = timedelta(days=90)
+# Abstand, in dem maybe_compact() den Verlauf tatsächlich verdichtet
+COMPACTION_INTERVAL = timedelta(days=7)
+
+
+class Transition(NamedTuple):
+    """Ein Eintrag im Verlauf eines Auftrags"""
+
+    state: Optional[str]
+    updated: Optional[datetime]  # summaryDate laut API
+    recorded_at: datetime  # Zeitpunkt, zu dem der Wechsel bemerkt wurde
+
+    @property
+    def changed_at(self) -> datetime:
+        """Zeitpunkt des Wechsels, bevorzugt laut API
+
+        Returns:
+            datetime: Der Zeitpunkt
+        """
+        return self.updated or self.recorded_at
+
+
+class StateChange(NamedTuple):
+    """Übergang eines Auftrags von einem Status in den nächsten"""
+
+    order: int
+    from_state: Optional[str]
+    to_state: Optional[str]
+    duration: timedelta
+
+
+def _parse(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class StatusHistory:
+    """
+    Abfragen auf den Verlauf der Statuswechsel.
+
+    Geschrieben wird der Verlauf ausschließlich von den Triggern der Auftragsablage:
+    Ein Eintrag entsteht nur, wenn sich ``summaryStateCode`` oder ``summaryDate`` eines
+    Auftrags tatsächlich ändert. Der Schreibaufwand hängt damit von der Anzahl der
+    Änderungen ab, nicht von der Anzahl der Aufträge.
+    """
+
+    def __init__(self, store: Optional[OrderStore] = None) -> None:
+        """Initialisiert die Abfragen
+
+        Args:
+            store (Optional[OrderStore], optional): Die Auftragsablage. Standard ist die geteilte Ablage.
+        """
+        self.store = store if store is not None else get_default_store()
+
+    def timeline(self, shop: int, order: int) -> list[Transition]:
+        """Gibt alle bekannten Statuswechsel eines Auftrags zurück, ältester zuerst
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            list[Transition]: Der Verlauf des Auftrags
+        """
+        rows = self.store.query(
+            "SELECT state, updated, recorded_at FROM history "
+            "WHERE shop = ? AND order_no = ? ORDER BY id",
+            (shop, order),
+        )
+        return [
+            Transition(state, _parse(updated), _parse(recorded_at))
+            for state, updated, recorded_at in rows
+        ]
+
+    def transition_times(
+        self, shop: int, since: Optional[datetime] = None
+    ) -> list[StateChange]:
+        """Gibt für alle Aufträge einer Filiale zurück, wie lange sie in einem Status verblieben sind
+
+        Args:
+            shop (int): Filialnummer
+            since (Optional[datetime], optional): Nur Wechsel ab diesem Zeitpunkt. Standard sind alle.
+
+        Returns:
+            list[StateChange]: Die Statuswechsel, nach Auftrag und Zeit sortiert
+        """
+        rows = self.store.query(
+            "SELECT order_no, state, updated, recorded_at FROM history "
+            "WHERE shop = ? ORDER BY order_no, id",
+            (shop,),
+        )
+        changes = []
+        previous: Optional[tuple[int, Transition]] = None
+        for order, state, updated, recorded_at in rows:
+            current = Transition(state, _parse(updated), _parse(recorded_at))
+            if previous is not None and previous[0] == order:
+                before = previous[1]
+                if since is None or current.changed_at >= since:
+                    changes.append(
+                        StateChange(
+                            order,
+                            before.state,
+                            current.state,
+                            current.changed_at - before.changed_at,
+                        )
+                    )
+            previous = (order, current)
+        return changes
+
+    def compact(self, retention: timedelta = DEFAULT_RETENTION) -> int:
+        """Verdichtet den Verlauf.
+
+        Entfernt werden Einträge, die ihren Vorgänger nur wiederholen (etwa nach erneutem
+        Hinzufügen eines Auftrags), sowie der Verlauf von Aufträgen, die nicht mehr
+        existieren und seit ``retention`` keinen Wechsel mehr hatten.
+
+        Args:
+            retention (timedelta, optional): Aufbewahrung für gelöschte Aufträge. Standard sind 90 Tage.
+
+        Returns:
+            int: Anzahl der entfernten Einträge
+        """
+        cutoff = (datetime.now() - retention).isoformat()
+        with self.store.transaction() as conn:
+            duplicates = conn.execute(
+                """
+                DELETE FROM history WHERE id IN (
+                    SELECT current.id FROM history AS current
+                    JOIN history AS previous ON previous.id = (
+                        SELECT MAX(id) FROM history
+                        WHERE shop = current.shop AND order_no = current.order_no
+                            AND id < current.id
+                    )
+                    WHERE previous.state IS current.state
+                        AND previous.updated IS current.updated
+                )
+                """
+            ).rowcount
+            orphans = conn.execute(
+                """
+                DELETE FROM history WHERE (shop, order_no) IN (
+                    SELECT shop, order_no FROM history
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM orders
+                        WHERE orders.shop = history.shop
+                            AND orders.order_no = history.order_no
+                    )
+                    GROUP BY shop, order_no
+                    HAVING MAX(recorded_at) < ?
+                )
+                """,
+                (cutoff,),
+            ).rowcount
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('compacted_at', ?)",
+                (datetime.now().isoformat(),),
+            )
+        return duplicates + orphans
+
+    def maybe_compact(
+        self,
+        interval: timedelta = COMPACTION_INTERVAL,
+        retention: timedelta = DEFAULT_RETENTION,
+    ) -> int:
+        """Verdichtet den Verlauf, falls die letzte Verdichtung länger als ``interval`` zurückliegt
+
+        Args:
+            interval (timedelta, optional): Mindestabstand zwischen zwei Verdichtungen. Standard sind 7 Tage.
+            retention (timedelta, optional): Aufbewahrung für gelöschte Aufträge. Standard sind 90 Tage.
+
+        Returns:
+            int: Anzahl der entfernten Einträge
+        """
+        row = self.store.query("SELECT value FROM meta WHERE key = 'compacted_at'")
+        if row and datetime.now() - datetime.fromisoformat(row[0][0]) < interval:
+            return 0
+        return self.compact(retention)
@@ -0,0 +1,66 @@
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def file_lock(path: Union[str, Path], exclusive: bool = True) -> Iterator[None]:
+    """Hält eine prozessübergreifende, empfehlende Sperre für eine Datei.
+
+    Gesperrt wird eine daneben liegende ``.lock``-Datei, damit die Sperre auch
+    erhalten bleibt, wenn die eigentliche Datei durch ``atomic_write`` ersetzt wird.
+    Mehrere lesende (geteilte) Sperren sind gleichzeitig möglich, eine schreibende
+    (exklusive) schließt alle anderen aus. Unter Windows sind alle Sperren exklusiv.
+
+    Args:
+        path (Union[str, Path]): Die zu sperrende Datei
+        exclusive (bool, optional): Schreibende statt lesende Sperre. Standard ist True.
+    """
+    lock_path = Path(str(path) + ".lock")
+    with open(lock_path, "a+b") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write(path: Union[str, Path], data: Union[str, bytes]):
+    """Schreibt eine Datei atomar: erst in eine temporäre Datei im selben Ordner,
+    dann wird diese in einem Schritt an die Zielstelle umbenannt. Leser sehen so
+    immer entweder die alte oder die vollständige neue Datei.
+
+    Args:
+        path (Union[str, Path]): Die Zieldatei
+        data (Union[str, bytes]): Der neue Inhalt (Text wird als UTF-8 geschrieben)
+    """
+    path = Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    descriptor, temp_name = tempfile.mkstemp(prefix=path.name + ".", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
@@ -1,13 +1,21 @@
-import pickle
-import time
-from typing import Optional
+import csv
+import itertools
+import json
+from datetime import datetime
+from typing import Iterable, List, Optional
 import typer
-from rich.progress import track
 
+# Nur leichtgewichtige Module werden beim Start geladen. requests (über .client),
+# rich.table und rich.progress importieren erst die Befehle, die sie brauchen.
+from .batch import DEFAULT_RATE, DEFAULT_WORKERS, iter_refresh, refresh_all
 from .fotoparadies import FotoparadiesStatus
+from .history import StatusHistory
+from .metrics import PROFILE_ENV, enable_profiling, span
+from .query import OrderQuery, parse_time
+from .scheduler import due_orders
+from .store import get_default_store
+from .transfer import TransferError, detect_format, read_orders, write_orders
 from rich.console import Console
-from rich.table import Table
-from platformdirs import user_config_dir
 from pathlib import Path
 import sys
 
@@ -15,42 +23,34 @@ app = typer.Typer()
 console = Console()
 
 
-def _get_orders_filepath() -> Path:
-    """Gibt einen Pfad zurück, an dem die Aufträge als Pickle-Datei abgelegt werden können.
-    Der Pfad ist abhängig vom Betriebssystem. Der Pfad wird angelegt, falls er nicht existiert.
-
-    Returns:
-        Path: Der Pfad, an dem die Aufträge als Pickle exportiert werden können.
-    """
-    app_path = Path(user_config_dir(appname="fotoparadies-status", appauthor="hija"))
-    app_path.mkdir(parents=True, exist_ok=True)
-
-    order_file = app_path / "orders.pkl"
-    return order_file
-
-
 def get_orders_list() -> list[FotoparadiesStatus]:
-    """Liest die eingespeicherte Pickle Datei ein und gibt eine Liste mit Auftragsstati zurück.
+    """Liest alle eingespeicherten Aufträge aus der Auftragsablage ein.
 
     Returns:
         list[FotoparadiesStatus]: Liste mit Fotoparadies-Stati
     """
-    order_file = _get_orders_filepath()
-    if order_file.exists():
-        file = open(order_file, "rb")
-        return pickle.load(file)
-
-    return []
+    return get_default_store().all()
 
 
 def save_orders_list(list: list[FotoparadiesStatus]):
-    """Speichert die Auftragsstati in einer Pickledatei ab
+    """Ersetzt den gesamten Bestand der Auftragsablage durch die übergebenen Aufträge
 
     Args:
         list (list[FotoparadiesStatus]): Liste der Autragsstati, die abgespeichert werden sollen.
     """
-    order_file = _get_orders_filepath()
-    pickle.dump(list, open(order_file, "wb"))
+    get_default_store().replace_all(list)
+
+
+def _format_date(value: Optional[datetime]) -> str:
+    """Formatiert einen Zeitpunkt für die Ausgabe
+
+    Args:
+        value (Optional[datetime]): Der Zeitpunkt
+
+    Returns:
+        str: Der formatierte Zeitpunkt oder ein leerer Text
+    """
+    return value.strftime("%d.%m.%Y %H:%M") if value else ""
 
 
 def _print_table_with_status(fp_stati: list[FotoparadiesStatus]):
@@ -59,13 +59,14 @@ def _print_table_with_status(fp_stati: list[FotoparadiesStatus]):
     Args:
         fp_stati (list[FotoparadiesStatus]): Die Auftragsstati, die ausgegeben werden sollen.
     """
+    from rich.table import Table
 
     table = Table("Name", "Letztes Update", "Status", "Preis")
 
     for fp_status in fp_stati:
         table.add_row(
             fp_status.ordername,
-            fp_status.getlastupdate,
+            _format_date(fp_status.getlastupdate),
             fp_status.currentstatus,
             fp_status.price,
         )
@@ -73,23 +74,181 @@ def _print_table_with_status(fp_stati: list[FotoparadiesStatus]):
     console.print(table)
 
 
+@app.callback()
+def main(
+    base_url: Optional[str] = typer.Option(
+        None,
+        "--base-url",
+        envvar="FOTOPARADIES_BASE_URL",
+        help="Basis-URL der API, z.B. eines lokalen Ersatzservers",
+    ),
+    replay: Optional[Path] = typer.Option(
+        None,
+        "--replay",
+        envvar="FOTOPARADIES_REPLAY",
+        help="Aufgezeichnete Antworten aus dieser Datei wiedergeben",
+    ),
+    record: Optional[Path] = typer.Option(
+        None,
+        "--record",
+        envvar="FOTOPARADIES_RECORD",
+        help="Alle Antworten in dieser Datei aufzeichnen",
+    ),
+    profile: Optional[Path] = typer.Option(
+        None,
+        "--profile",
+        envvar=PROFILE_ENV,
+        help="Laufzeiten messen und beim Beenden in diese Datei schreiben (.prom oder .json)",
+    ),
+):
+    """Zeigt den Status von Fotoparadies-Aufträgen an"""
+    if profile:
+        enable_profiling(profile)
+    if base_url or replay or record:
+        from .client import configure_default_client
+
+        try:
+            configure_default_client(base_url=base_url, replay=replay, record=record)
+        except (OSError, ValueError) as error:
+            # z.B. fehlende oder ungültige Datei für --replay
+            console.print(f":x: Aufgezeichnete Antworten können nicht geladen werden: {error}")
+            raise typer.Exit(1)
+
+
+STATUS_FORMATS = ("table", "json", "ndjson", "csv")
+
+# Filteroptionen, die status, cleanup und remove gemeinsam haben
+_STATE_FILTER = typer.Option(
+    None, "--status", help="Nur Aufträge mit diesem Status, mehrfach möglich"
+)
+_SHOP_FILTER = typer.Option(None, "--shop", help="Nur Aufträge dieser Filiale")
+_SINCE_FILTER = typer.Option(
+    None, "--since", help="Nur Aufträge mit Update seit (z.B. 2024-05-01 oder 3d)"
+)
+_BEFORE_FILTER = typer.Option(
+    None, "--before", help="Nur Aufträge mit Update vor (z.B. 2024-05-01 oder 3d)"
+)
+_NAME_FILTER = typer.Option(
+    None, "--name-glob", help="Nur Aufträge, deren Name auf das Muster passt (z.B. urlaub*)"
+)
+
+
+def _positive_rate(value: float) -> float:
+    """Prüft die Option --rate, der Token-Bucket braucht eine Rate über 0"""
+    if value <= 0:
+        raise typer.BadParameter("muss größer als 0 sein")
+    return value
+
+
+def _build_query(
+    states: Optional[List[str]],
+    shop: Optional[int],
+    since: Optional[str],
+    before: Optional[str],
+    name_glob: Optional[str],
+) -> OrderQuery:
+    """Setzt die Filteroptionen eines Befehls zu einer Abfrage zusammen
+
+    Raises:
+        typer.BadParameter: Wenn ein Zeitpunkt ungültig ist
+
+    Returns:
+        OrderQuery: Die Abfrage (leer, falls keine Option gesetzt ist)
+    """
+    try:
+        return OrderQuery(
+            states=tuple(states or ()),
+            shop=shop,
+            since=parse_time(since) if since else None,
+            before=parse_time(before) if before else None,
+            name_glob=name_glob,
+        )
+    except ValueError as error:
+        raise typer.BadParameter(f"Ungültiger Zeitpunkt: {error}")
+
+
 @app.command()
-def status():
+def status(
+    rate: float = typer.Option(
+        DEFAULT_RATE, callback=_positive_rate, help="Maximale Anzahl Anfragen pro Sekunde"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, min=1, help="Maximale Anzahl gleichzeitiger Anfragen"
+    ),
+    due: bool = typer.Option(
+        False, "--due", help="Nur fällige Aufträge bei der API abfragen"
+    ),
+    fmt: str = typer.Option(
+        "table", "--format", help="Ausgabeformat: table, json, ndjson oder csv"
+    ),
+    states: Optional[List[str]] = _STATE_FILTER,
+    shop: Optional[int] = _SHOP_FILTER,
+    since: Optional[str] = _SINCE_FILTER,
+    before: Optional[str] = _BEFORE_FILTER,
+    name_glob: Optional[str] = _NAME_FILTER,
+):
     """Gibt die Stati der abgespeicherten Aufträge in einer Tabelle aus"""
-    current_list = get_orders_list()
+    if fmt not in STATUS_FORMATS:
+        console.print(f":x: Unbekanntes Format: {fmt}")
+        raise typer.Exit(1)
+    query = _build_query(states, shop, since, before, name_glob)
+
+    from rich.progress import track
+
+    from .client import get_default_client
+
+    # Mit Filter werden nur die passenden Aufträge über die Indizes geladen und abgefragt
+    current_list = get_default_store().find(query) if query else get_orders_list()
+    client = get_default_client()
+    to_refresh = due_orders(current_list) if due else current_list
+
+    # Die Aufträge werden parallel aktualisiert, der Token-Bucket begrenzt dabei die
+    # Anfragen pro Sekunde, um die API nicht zu überfordern
+    refreshed = iter_refresh(to_refresh, client=client, rate=rate, max_workers=workers)
+
+    with span("refresh_cycle", command="status"):
+        if fmt in ("ndjson", "csv"):
+            # Jede Zeile wird geschrieben, sobald ihr Auftrag fertig ist: zuerst die nicht
+            # fälligen Aufträge, dann die abgefragten in der Reihenfolge ihrer Fertigstellung
+            pending = {id(order) for order in to_refresh}
+            not_due = (order for order in current_list if id(order) not in pending)
+            _stream_status(itertools.chain(not_due, refreshed), fmt)
+        else:
+            for _ in track(
+                refreshed,
+                description="Aufträge werden aktualisiert",
+                total=len(to_refresh),
+                disable=fmt != "table",
+            ):
+                pass
+
+        get_default_store().save_status(to_refresh)
+    StatusHistory().maybe_compact()
+    if fmt == "json":
+        json.dump([order.as_dict() for order in current_list], sys.stdout, ensure_ascii=False)
+        sys.stdout.write("\n")
+    elif fmt == "table":
+        _print_table_with_status(current_list)
+
+
+def _stream_status(orders: Iterable[FotoparadiesStatus], fmt: str):
+    """Schreibt Auftragsstati zeilenweise als NDJSON oder CSV auf die Standardausgabe
 
-    for fp_status in track(
-        current_list,
-        description="Aufträge werden aktualisiert",
-        total=len(current_list),
-    ):
-        fp_status.refresh()
-        time.sleep(
-            1
-        )  # Nach jeder Aktualisierung wird 1s gewartet um die API nicht zu überfordern
-
-    save_orders_list(current_list)
-    _print_table_with_status(current_list)
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Die Aufträge, gern auch als Generator
+        fmt (str): ndjson oder csv
+    """
+    writer = None
+    for order in orders:
+        record = order.as_dict()
+        if fmt == "ndjson":
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            if writer is None:
+                writer = csv.DictWriter(sys.stdout, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+        sys.stdout.flush()
 
 
 @app.command()
@@ -101,60 +260,93 @@ def add(shop: int, order: int, name: Optional[str] = typer.Argument(None)):
         order (int): Die Auftragsnummer
         name (Optional[str], optional): Ein Name, mit dem der Auftrag wiedererkannt werden kann
     """
-    fp_status = FotoparadiesStatus(shop, order, name, fetch_data=False)
-    current_list = get_orders_list()
+    store = get_default_store()
 
-    for elem in current_list:
-        if elem._order == order and elem._shop == shop:
-            console.print(
-                f":x: Der Auftrag [bold]befindet sich bereits[/bold] unter dem Name {elem.ordername} [bold]in der Liste[/bold]!"
-            )
-            return
-        if elem.ordername == name:
-            console.print(
-                ":x: Ein Auftrag mit identischem Namen befindet sich bereits in der Liste. Ein weiterer [bold]Auftrag muss[/bold] einen [bold]anderen Namen haben[/bold]."
-            )
+    existing = store.get(shop, order)
+    if existing is not None:
+        console.print(
+            f":x: Der Auftrag [bold]befindet sich bereits[/bold] unter dem Name {existing.ordername} [bold]in der Liste[/bold]!"
+        )
+        return
+    if name and store.find_by_name(name) is not None:
+        console.print(
+            ":x: Ein Auftrag mit identischem Namen befindet sich bereits in der Liste. Ein weiterer [bold]Auftrag muss[/bold] einen [bold]anderen Namen haben[/bold]."
+        )
+        return
 
-    current_list.append(fp_status)
-    save_orders_list(current_list)
+    store.add(FotoparadiesStatus(shop, order, name, fetch_data=False))
     console.print(
         ":heavy_check_mark: Der [bold]Auftrag[/bold] wurde [bold]hinzugefügt[/bold]."
     )
 
 
 @app.command()
-def remove(name: str):
-    """Löscht einen Fotoauftrag
+def remove(
+    name: Optional[str] = typer.Argument(None),
+    states: Optional[List[str]] = _STATE_FILTER,
+    shop: Optional[int] = _SHOP_FILTER,
+    since: Optional[str] = _SINCE_FILTER,
+    before: Optional[str] = _BEFORE_FILTER,
+    name_glob: Optional[str] = _NAME_FILTER,
+):
+    """Löscht einen Fotoauftrag oder alle Aufträge, auf die die Filter passen
 
     Args:
-        name (str): Der Name des Auftrags
+        name (Optional[str], optional): Der Name des Auftrags
     """
-    current_list = get_orders_list()
-    for elem in current_list:
-        if elem.ordername and elem.ordername == name:
-            current_list.remove(elem)
+    query = _build_query(states, shop, since, before, name_glob)
+    if name is not None and query:
+        raise typer.BadParameter(
+            "Bitte entweder einen Namen oder Filter angeben, nicht beides.", param_hint="NAME"
+        )
+    store = get_default_store()
+
+    if name is None:
+        if not query:
+            console.print(
+                ":x: Bitte [bold]einen Namen oder einen Filter[/bold] angeben."
+            )
+            raise typer.Exit(1)
+        removed_entries = len(store.delete_matching(query))
+        if removed_entries > 0:
+            console.print(
+                f":heavy_check_mark: Es [bold]wurde(n) {removed_entries} Aufträge gelöscht[/bold]!"
+            )
+            return
+    else:
+        elem = store.find_by_name(name)
+        if elem is not None and store.delete(elem._shop, elem._order):
             console.print(":heavy_check_mark: Der [bold]Auftrag wurde gelöscht[/bold]!")
-            save_orders_list(current_list)
             return
     console.print(":x: Der [bold]Auftrag[/bold] wurde [bold]nicht gefunden[/bold].")
 
 
 @app.command()
-def cleanup():
-    """Löscht Aufträge, die bereits zurückgeschickt wurden (Status DELIVERED)"""
-
-    current_list = get_orders_list()
-    list_without_delivered = [
-        order
-        for order in current_list
-        if not (order.currentstatus and order.currentstatus == "DELIVERED")
-    ]
-    save_orders_list(list_without_delivered)
-
-    removed_entries = len(current_list) - len(list_without_delivered)
+def cleanup(
+    states: Optional[List[str]] = _STATE_FILTER,
+    shop: Optional[int] = _SHOP_FILTER,
+    since: Optional[str] = _SINCE_FILTER,
+    before: Optional[str] = _BEFORE_FILTER,
+    name_glob: Optional[str] = _NAME_FILTER,
+):
+    """Löscht Aufträge, die bereits zurückgeschickt wurden (Status DELIVERED), oder mit
+    --status die Aufträge mit anderem Status"""
+
+    query = _build_query(states or ["DELIVERED"], shop, since, before, name_glob)
+    removed_entries = len(get_default_store().delete_matching(query))
+    StatusHistory().maybe_compact()
     if removed_entries > 0:
+        filtered = shop is not None or since or before or name_glob
+        if states and not filtered:
+            reason = f"die den Status {', '.join(states)} haben"
+        elif states:
+            reason = "die auf die Filter passen"
+        elif filtered:
+            reason = "die bereits geliefert wurden und auf die Filter passen"
+        else:
+            reason = "die bereits geliefert wurden"
         console.print(
-            f":heavy_check_mark: Es [bold]wurde(n) {removed_entries} Aufträge[/bold], die bereits geliefert wurden, [bold]gelöscht[/bold]."
+            f":heavy_check_mark: Es [bold]wurde(n) {removed_entries} Aufträge[/bold], {reason}, [bold]gelöscht[/bold]."
         )
     else:
         console.print(
@@ -162,6 +354,185 @@ def cleanup():
         )
 
 
+@app.command("import")
+def import_orders(
+    path: Path = typer.Argument(..., help="CSV- oder JSONL-Datei, - für die Standardeingabe"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="csv oder jsonl"),
+    fetch: bool = typer.Option(
+        False, "--fetch", help="Status der neuen Aufträge direkt abfragen"
+    ),
+    rate: float = typer.Option(
+        DEFAULT_RATE, callback=_positive_rate, help="Maximale Anzahl Anfragen pro Sekunde"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, min=1, help="Maximale Anzahl gleichzeitiger Anfragen"
+    ),
+):
+    """Fügt viele Aufträge aus einer CSV- oder JSONL-Datei (shop, order, name) hinzu"""
+    stdin = str(path) == "-"
+    try:
+        fmt = detect_format(path, fmt or ("csv" if stdin else None))
+        file = sys.stdin if stdin else open(path, "r", encoding="utf-8", newline="")
+        try:
+            # Die Datei wird gestreamt, alle neuen Aufträge landen in einer Transaktion
+            added = get_default_store().add_many(read_orders(file, fmt))
+        finally:
+            if not stdin:
+                file.close()
+    except (OSError, TransferError) as error:
+        console.print(f":x: Der Import ist [bold]fehlgeschlagen[/bold]: {error}")
+        raise typer.Exit(1)
+
+    console.print(
+        f":heavy_check_mark: Es [bold]wurde(n) {len(added)} Aufträge hinzugefügt[/bold]."
+    )
+    if fetch and added:
+        refresh_all(added, rate=rate, max_workers=workers)
+        get_default_store().save_status(added)
+
+
+@app.command()
+def export(
+    path: Path = typer.Argument(..., help="Zieldatei, - für die Standardausgabe"),
+    fmt: Optional[str] = typer.Option(None, "--format", help="csv oder jsonl"),
+):
+    """Schreibt alle Aufträge (shop, order, name) in eine CSV- oder JSONL-Datei"""
+    stdout = str(path) == "-"
+    try:
+        fmt = detect_format(path, fmt or ("csv" if stdout else None))
+        if stdout:
+            write_orders(get_orders_list(), sys.stdout, fmt)
+            return
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            count = write_orders(get_orders_list(), file, fmt)
+    except (OSError, TransferError) as error:
+        console.print(f":x: Der Export ist [bold]fehlgeschlagen[/bold]: {error}")
+        raise typer.Exit(1)
+    console.print(
+        f":heavy_check_mark: Es [bold]wurde(n) {count} Aufträge exportiert[/bold]."
+    )
+
+
+@app.command()
+def watch(
+    fmt: str = typer.Option(
+        "text", "--format", help="Ausgabeformat der Statuswechsel: text oder ndjson"
+    ),
+    rate: float = typer.Option(
+        DEFAULT_RATE, callback=_positive_rate, help="Maximale Anzahl Anfragen pro Sekunde"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, min=1, help="Maximale Anzahl gleichzeitiger Anfragen"
+    ),
+):
+    """Fragt die Aufträge dauerhaft ab und gibt nur Statuswechsel aus"""
+    from .watch import watch_changes
+
+    if fmt not in ("text", "ndjson"):
+        console.print(f":x: Unbekanntes Format: {fmt}")
+        raise typer.Exit(1)
+
+    try:
+        for change in watch_changes(rate=rate, max_workers=workers):
+            if fmt == "ndjson":
+                sys.stdout.write(json.dumps(change.as_dict(), ensure_ascii=False) + "\n")
+                sys.stdout.flush()
+                continue
+            order = change.order
+            console.print(
+                f"{_format_date(order.getlastupdate)} [bold]{order.ordername}[/bold]: "
+                f"{change.previous_state or '-'} :arrow_right: [bold]{order.currentstatus}[/bold]"
+            )
+    except KeyboardInterrupt:
+        pass
+
+
+@app.command()
+def history(name: str):
+    """Zeigt den Verlauf der Statuswechsel eines Auftrags
+
+    Args:
+        name (str): Der Name des Auftrags
+    """
+    elem = get_default_store().find_by_name(name)
+    if elem is None:
+        console.print(":x: Der [bold]Auftrag[/bold] wurde [bold]nicht gefunden[/bold].")
+        return
+
+    from rich.table import Table
+
+    table = Table("Status", "Letztes Update", "Bemerkt")
+    for transition in StatusHistory().timeline(elem._shop, elem._order):
+        table.add_row(
+            transition.state,
+            _format_date(transition.updated),
+            _format_date(transition.recorded_at),
+        )
+    console.print(table)
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Adresse des Servers"),
+    port: int = typer.Option(8766, help="Port des Servers"),
+    rate: float = typer.Option(
+        DEFAULT_RATE, callback=_positive_rate, help="Maximale Anzahl Anfragen pro Sekunde an die API"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_WORKERS, min=1, help="Maximale Anzahl gleichzeitiger Anfragen an die API"
+    ),
+):
+    """Startet einen lokalen Server, der die Aufträge für alle CLI- und GUI-Instanzen abfragt"""
+    from .server import CHANGES_PATH, StatusServer
+
+    server = StatusServer(host=host, port=port, rate=rate, max_workers=workers)
+    server.start_polling()
+    console.print(
+        f":globe_with_meridians: Statusserver läuft unter [bold]{server.base_url}[/bold], "
+        f"z.B. [bold]fotoparadies --base-url {server.base_url} status[/bold]. "
+        f"Statuswechsel gibt es unter {server.base_url}{CHANGES_PATH}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+@app.command()
+def standin(
+    host: str = typer.Option("127.0.0.1", help="Adresse des Servers"),
+    port: int = typer.Option(8765, help="Port des Servers"),
+    latency: float = typer.Option(0.0, help="Feste Antwortzeit in Sekunden"),
+    jitter: float = typer.Option(0.0, help="Zufällige zusätzliche Antwortzeit in Sekunden"),
+    error_rate: float = typer.Option(0.0, help="Anteil der Anfragen mit Serverfehler (503)"),
+    unknown_rate: float = typer.Option(0.0, help="Anteil der unbekannten Aufträge (404)"),
+    transition_seconds: float = typer.Option(60.0, help="Dauer eines Status in Sekunden"),
+):
+    """Startet einen lokalen Ersatzserver, der die Fotoparadies API simuliert"""
+    from .standin import StandInServer, StandInState
+
+    state = StandInState(
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+        unknown_rate=unknown_rate,
+        transition_seconds=transition_seconds,
+    )
+    server = StandInServer(host=host, port=port, state=state)
+    console.print(
+        f":globe_with_meridians: Ersatzserver läuft unter [bold]{server.base_url}[/bold], "
+        f"z.B. [bold]fotoparadies --base-url {server.base_url} status[/bold]"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 if __name__ == "__main__":
     # Check if --gui flag is provided
     if len(sys.argv) > 1 and sys.argv[1] == "--gui":
@@ -0,0 +1,226 @@
+import atexit
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+from .locking import atomic_write
+
+PROFILE_ENV = "FOTOPARADIES_PROFILE"
+# Obergrenzen der Histogramm-Buckets in Sekunden
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Höchstzahl aufgezeichneter Spans, damit ein langer watch-Lauf nicht unbegrenzt wächst
+MAX_SPANS = 100_000
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: str = "") -> str:
+    parts = [f'{key}="{value}"' for key, value in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Histogram:
+    """
+    Latenz-Histogramm mit festen Buckets im Format von Prometheus.
+    """
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKETS) + 1)  # der letzte Bucket ist +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(BUCKETS, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+class Metrics:
+    """
+    Sammelt Latenz-Histogramme, Zähler und Spans für die Laufzeitanalyse.
+
+    Solange die Messung nicht eingeschaltet ist, kostet ``span`` nur einen Funktionsaufruf.
+    Die Ergebnisse lassen sich als Prometheus-Textdatei (``.prom``) oder als JSON-Trace im
+    Chrome-Trace-Format (``.json``, z.B. für Perfetto) ausgeben.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.histograms: dict[tuple[str, Labels], Histogram] = {}
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.spans: list[dict] = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def observe(self, name: str, seconds: float, **labels: object):
+        """Trägt eine Dauer in ein Histogramm ein
+
+        Args:
+            name (str): Name der Messgröße, z.B. api_fetch
+            seconds (float): Die Dauer in Sekunden
+        """
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def count(self, name: str, amount: float = 1, **labels: object):
+        """Erhöht einen Zähler
+
+        Args:
+            name (str): Name des Zählers, z.B. api_responses
+            amount (float, optional): Der Betrag. Standard ist 1.
+        """
+        if not self.enabled:
+            return
+        key = (name, _labels(labels))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def _span(self, name: str, labels: dict[str, object]) -> Iterator[None]:
+        start = time.perf_counter()
+        error: Optional[str] = None
+        try:
+            yield
+        except BaseException as exception:
+            error = type(exception).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(name, duration, **labels)
+            if error is not None:
+                self.count(f"{name}_errors", error=error, **labels)
+            args = {key: str(value) for key, value in labels.items()}
+            if error is not None:
+                args["error"] = error
+            with self._lock:
+                if len(self.spans) < MAX_SPANS:
+                    self.spans.append(
+                        {
+                            "name": name,
+                            "ph": "X",
+                            "ts": (start - self._origin) * 1e6,
+                            "dur": duration * 1e6,
+                            "pid": os.getpid(),
+                            "tid": threading.get_ident(),
+                            "args": args,
+                        }
+                    )
+
+    def span(self, name: str, **labels: object):
+        """Misst die Dauer eines Abschnitts als Histogramm und Span.
+        Schlägt der Abschnitt fehl, wird zusätzlich ``<name>_errors`` hochgezählt.
+
+        Args:
+            name (str): Name des Abschnitts, z.B. store_load
+
+        Returns:
+            ContextManager: Der zu messende Abschnitt
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(name, labels)
+
+    def to_prometheus(self) -> str:
+        """Gibt alle Histogramme und Zähler im Textformat von Prometheus zurück
+
+        Returns:
+            str: Die Messwerte
+        """
+        lines = []
+        typed = set()
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"fotoparadies_{name}_total"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f"fotoparadies_{name}_seconds"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    bucket = _format_labels(labels, f'le="{le}"')
+                    lines.append(f"{metric}_bucket{bucket} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.total:.6f}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def to_trace(self) -> str:
+        """Gibt alle Spans im Chrome-Trace-Format zurück
+
+        Returns:
+            str: Der Trace als JSON
+        """
+        with self._lock:
+            return json.dumps({"traceEvents": list(self.spans)})
+
+    def export(self, path: Union[str, Path]):
+        """Schreibt die Messwerte in eine Datei. Bei der Endung ``.json`` als Trace,
+        sonst als Prometheus-Textdatei
+
+        Args:
+            path (Union[str, Path]): Die Zieldatei
+        """
+        path = Path(path)
+        data = self.to_trace() if path.suffix.lower() == ".json" else self.to_prometheus()
+        atomic_write(path, data)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+metrics = Metrics()
+span = metrics.span
+
+
+def enable_profiling(path: Optional[Union[str, Path]] = None) -> Optional[Path]:
+    """Schaltet die Messung ein und schreibt die Ergebnisse beim Beenden des Programms.
+    Ohne Pfad wird die Umgebungsvariable FOTOPARADIES_PROFILE ausgewertet.
+
+    Args:
+        path (Optional[Union[str, Path]], optional): Zieldatei (.prom oder .json)
+
+    Returns:
+        Optional[Path]: Die Zieldatei oder None, falls die Messung aus bleibt
+    """
+    path = path or os.environ.get(PROFILE_ENV)
+    if not path:
+        return None
+    path = Path(path)
+    if not metrics.enabled:
+        metrics.enabled = True
+        atexit.register(lambda: metrics.export(path))
+    return path
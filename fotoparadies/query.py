@@ -0,0 +1,75 @@
+import re
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+_RELATIVE = re.compile(r"^(\d+)\s*([mhdw])$")
+_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_time(value: str, now: Optional[datetime] = None) -> datetime:
+    """Liest einen Zeitpunkt, entweder absolut (ISO 8601, z.B. 2024-05-01) oder relativ
+    zur aktuellen Zeit (z.B. 30m, 12h, 3d, 2w)
+
+    Args:
+        value (str): Der Zeitpunkt als Text
+        now (Optional[datetime], optional): Bezugszeitpunkt für relative Angaben. Standard ist jetzt.
+
+    Raises:
+        ValueError: Wenn der Text kein gültiger Zeitpunkt ist
+
+    Returns:
+        datetime: Der Zeitpunkt
+    """
+    match = _RELATIVE.match(value.strip().lower())
+    if match:
+        amount, unit = match.groups()
+        return (now or datetime.now()) - timedelta(**{_UNITS[unit]: int(amount)})
+    return datetime.fromisoformat(value.strip())
+
+
+class OrderQuery(NamedTuple):
+    """
+    Filter für Aufträge, der in eine SQL-Bedingung übersetzt wird.
+
+    Status, Filiale und letztes Update werden über Indizes der Auftragsablage gesucht,
+    das Namensmuster wird nur noch auf die so gefundenen Aufträge angewendet.
+    """
+
+    states: tuple[str, ...] = ()
+    shop: Optional[int] = None
+    since: Optional[datetime] = None  # letztes Update zu oder nach diesem Zeitpunkt
+    before: Optional[datetime] = None  # letztes Update vor diesem Zeitpunkt
+    name_glob: Optional[str] = None  # Muster wie "urlaub*", passt auch auf die Auftragsnummer
+
+    def __bool__(self) -> bool:
+        return any(
+            (self.states, self.shop is not None, self.since, self.before, self.name_glob)
+        )
+
+    def where(self) -> tuple[str, tuple]:
+        """Übersetzt den Filter in eine SQL-Bedingung für die Tabelle orders
+
+        Returns:
+            tuple[str, tuple]: Die Bedingung (leer, falls nichts gefiltert wird) und ihre Parameter
+        """
+        conditions = []
+        parameters: list = []
+        if self.states:
+            conditions.append(f"state IN ({', '.join('?' * len(self.states))})")
+            parameters.extend(state.upper() for state in self.states)
+        if self.shop is not None:
+            conditions.append("shop = ?")
+            parameters.append(self.shop)
+        if self.since is not None:
+            conditions.append("updated >= ?")
+            parameters.append(self.since.isoformat())
+        if self.before is not None:
+            conditions.append("updated < ?")
+            parameters.append(self.before.isoformat())
+        if self.name_glob:
+            # Aufträge ohne eigenen Namen heißen wie ihre Auftragsnummer
+            conditions.append("COALESCE(name, CAST(order_no AS TEXT)) GLOB ?")
+            parameters.append(self.name_glob)
+        if not conditions:
+            return "", ()
+        return "WHERE " + " AND ".join(conditions), tuple(parameters)
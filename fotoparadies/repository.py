@@ -0,0 +1,185 @@
+import threading
+from typing import Iterable, Optional
+
+from .fotoparadies import FotoparadiesStatus
+from .store import OrderStore, get_default_store
+
+OrderKey = tuple[int, int]
+
+
+class OrderRepository:
+    """
+    Langlebiger Zwischenspeicher der Aufträge im Arbeitsspeicher.
+
+    Die Aufträge liegen hinter Hash-Indizes auf (Filiale, Auftragsnummer) und auf dem
+    Namen. Aus der Datenbank wird nur neu geladen, wenn ein anderer Prozess sie
+    verändert hat (``PRAGMA data_version``). Zurückgeschrieben werden nur die Aufträge,
+    die sich geändert haben.
+    """
+
+    def __init__(self, store: Optional[OrderStore] = None) -> None:
+        """Initialisiert den Zwischenspeicher
+
+        Args:
+            store (Optional[OrderStore], optional): Die zugrunde liegende Ablage. Standard ist die geteilte Ablage.
+        """
+        self.store = store if store is not None else get_default_store()
+        self._by_key: dict[OrderKey, FotoparadiesStatus] = {}
+        self._by_name: dict[str, OrderKey] = {}
+        self._dirty: dict[OrderKey, FotoparadiesStatus] = {}
+        self._version: Optional[int] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _key(status: FotoparadiesStatus) -> OrderKey:
+        return (status._shop, status._order)
+
+    def _index(self, status: FotoparadiesStatus):
+        key = self._key(status)
+        self._by_key[key] = status
+        self._by_name[status.ordername] = key
+
+    def _unindex(self, key: OrderKey) -> Optional[FotoparadiesStatus]:
+        status = self._by_key.pop(key, None)
+        if status is not None:
+            self._by_name.pop(status.ordername, None)
+            self._dirty.pop(key, None)
+        return status
+
+    def _ensure_fresh(self):
+        """Lädt alle Aufträge neu, falls sich die Datenbank seit dem letzten Laden geändert hat"""
+        version = self.store.data_version()
+        if version == self._version:
+            return
+        # Noch nicht geschriebene Änderungen gehen beim Neuladen nicht verloren
+        self.flush()
+        self._by_key.clear()
+        self._by_name.clear()
+        for status in self.store.all():
+            self._index(status)
+        self._version = version
+
+    def all(self) -> list[FotoparadiesStatus]:
+        """Gibt alle Aufträge in der Reihenfolge zurück, in der sie hinzugefügt wurden
+
+        Returns:
+            list[FotoparadiesStatus]: Alle Aufträge
+        """
+        with self._lock:
+            self._ensure_fresh()
+            return list(self._by_key.values())
+
+    def get(self, shop: int, order: int) -> Optional[FotoparadiesStatus]:
+        """Sucht einen Auftrag anhand von Filiale und Auftragsnummer
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            Optional[FotoparadiesStatus]: Der Auftrag oder None
+        """
+        with self._lock:
+            self._ensure_fresh()
+            return self._by_key.get((shop, order))
+
+    def find_by_name(self, name: str) -> Optional[FotoparadiesStatus]:
+        """Sucht einen Auftrag anhand seines Namens (benutzerdefiniert oder Auftragsnummer)
+
+        Args:
+            name (str): Der Name des Auftrags
+
+        Returns:
+            Optional[FotoparadiesStatus]: Der Auftrag oder None
+        """
+        with self._lock:
+            self._ensure_fresh()
+            key = self._by_name.get(name)
+            return self._by_key.get(key) if key is not None else None
+
+    def add(self, status: FotoparadiesStatus) -> bool:
+        """Fügt einen Auftrag hinzu und schreibt ihn sofort in die Ablage
+
+        Args:
+            status (FotoparadiesStatus): Der neue Auftrag
+
+        Returns:
+            bool: False, falls es den Auftrag oder seinen Namen bereits gibt
+        """
+        with self._lock:
+            self._ensure_fresh()
+            if not self.store.add(status):
+                return False
+            self._index(status)
+            return True
+
+    def remove(self, shop: int, order: int) -> bool:
+        """Löscht einen Auftrag
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            bool: True, falls ein Auftrag gelöscht wurde
+        """
+        with self._lock:
+            self._ensure_fresh()
+            self._unindex((shop, order))
+            return self.store.delete(shop, order)
+
+    def remove_by_state(self, state: str) -> list[FotoparadiesStatus]:
+        """Löscht alle Aufträge mit einem bestimmten Status
+
+        Args:
+            state (str): Der Status, z.B. DELIVERED
+
+        Returns:
+            list[FotoparadiesStatus]: Die gelöschten Aufträge
+        """
+        with self._lock:
+            self._ensure_fresh()
+            self.flush()
+            deleted = self.store.delete_by_state(state)
+            for status in deleted:
+                self._unindex(self._key(status))
+            return deleted
+
+    def mark_dirty(self, statuses: Iterable[FotoparadiesStatus]):
+        """Merkt geänderte Aufträge zum Zurückschreiben vor
+
+        Args:
+            statuses (Iterable[FotoparadiesStatus]): Die geänderten Aufträge
+        """
+        with self._lock:
+            for status in statuses:
+                key = self._key(status)
+                current = self._by_key.get(key)
+                if current is None:
+                    continue
+                if current is not status:
+                    # Nach einem Neuladen liegt hier ein anderes Objekt mit dem alten
+                    # Stand. Das geänderte ersetzt es, denn das eigene Schreiben ändert
+                    # data_version nicht und löst daher kein erneutes Laden aus.
+                    if self._by_name.get(current.ordername) == key:
+                        del self._by_name[current.ordername]
+                    self._by_key[key] = status  # behält die Position in der Reihenfolge
+                    self._by_name[status.ordername] = key
+                self._dirty[key] = status
+
+    def flush(self):
+        """Schreibt die geänderten Aufträge in die Ablage"""
+        with self._lock:
+            if self._dirty:
+                self.store.save_status(self._dirty.values())
+                self._dirty.clear()
+
+    def save_status(self, statuses: Iterable[FotoparadiesStatus]):
+        """Merkt geänderte Aufträge vor und schreibt sie sofort zurück
+
+        Args:
+            statuses (Iterable[FotoparadiesStatus]): Die geänderten Aufträge
+        """
+        with self._lock:
+            self.mark_dirty(statuses)
+            self.flush()
@@ -0,0 +1,112 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+from .fotoparadies import FotoparadiesStatus
+
+# Aufträge in diesen Stati ändern sich nicht mehr und werden nie abgefragt
+TERMINAL_STATES = frozenset({"DELIVERED"})
+
+# Minimaler Abstand zwischen zwei Abfragen, abhängig vom Auftragsstatus
+BASE_INTERVALS = {
+    "READY": timedelta(minutes=30),
+    "ERROR": timedelta(minutes=15),
+}
+DEFAULT_INTERVAL = timedelta(minutes=5)
+MAX_INTERVAL = timedelta(hours=6)
+
+# Anteil der Zeit seit der letzten Statusänderung, der bis zur nächsten Abfrage vergeht.
+# Ein Auftrag, der sich seit zwei Tagen nicht bewegt hat, wird so etwa alle 5 Stunden abgefragt.
+STALENESS_FACTOR = 0.1
+
+
+def poll_interval(
+    order: FotoparadiesStatus, now: Optional[datetime] = None
+) -> Optional[timedelta]:
+    """Berechnet den Abstand zwischen zwei Abfragen eines Auftrags
+
+    Args:
+        order (FotoparadiesStatus): Der Auftrag
+        now (Optional[datetime], optional): Aktueller Zeitpunkt. Standard ist datetime.now().
+
+    Returns:
+        Optional[timedelta]: Abstand zwischen zwei Abfragen oder None, falls der Auftrag nicht mehr abgefragt werden muss
+    """
+    status = order.currentstatus
+    if status in TERMINAL_STATES:
+        return None
+
+    interval = BASE_INTERVALS.get(status, DEFAULT_INTERVAL)
+    lastupdate = order.getlastupdate
+    if lastupdate is not None:
+        now = now or datetime.now()
+        interval = max(interval, (now - lastupdate) * STALENESS_FACTOR)
+    return min(interval, MAX_INTERVAL)
+
+
+def next_due(
+    order: FotoparadiesStatus, now: Optional[datetime] = None
+) -> Optional[datetime]:
+    """Berechnet den Zeitpunkt, an dem ein Auftrag das nächste Mal abgefragt werden soll
+
+    Args:
+        order (FotoparadiesStatus): Der Auftrag
+        now (Optional[datetime], optional): Aktueller Zeitpunkt. Standard ist datetime.now().
+
+    Returns:
+        Optional[datetime]: Zeitpunkt der nächsten Abfrage oder None, falls der Auftrag nicht mehr abgefragt werden muss
+    """
+    now = now or datetime.now()
+    if order.failures:
+        # Nach fehlgeschlagenen Abfragen wird exponentiell länger gewartet
+        retry_delay = min(MAX_INTERVAL, DEFAULT_INTERVAL * 2 ** (order.failures - 1))
+        return order.failed_at + retry_delay
+
+    if order.fetched_at is None:
+        # Noch nie abgefragte Aufträge sind sofort fällig
+        return now
+
+    interval = poll_interval(order, now=now)
+    if interval is None:
+        return None
+    return order.fetched_at + interval
+
+
+def due_orders(
+    orders: Iterable[FotoparadiesStatus], now: Optional[datetime] = None
+) -> list[FotoparadiesStatus]:
+    """Gibt die Aufträge zurück, die jetzt abgefragt werden sollen
+
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Alle Aufträge
+        now (Optional[datetime], optional): Aktueller Zeitpunkt. Standard ist datetime.now().
+
+    Returns:
+        list[FotoparadiesStatus]: Die fälligen Aufträge
+    """
+    now = now or datetime.now()
+    due = []
+    for order in orders:
+        due_at = next_due(order, now=now)
+        if due_at is not None and due_at <= now:
+            due.append(order)
+    return due
+
+
+def seconds_until_next_due(
+    orders: Iterable[FotoparadiesStatus], now: Optional[datetime] = None
+) -> Optional[float]:
+    """Berechnet die Wartezeit bis zum nächsten fälligen Auftrag
+
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Alle Aufträge
+        now (Optional[datetime], optional): Aktueller Zeitpunkt. Standard ist datetime.now().
+
+    Returns:
+        Optional[float]: Wartezeit in Sekunden oder None, falls kein Auftrag mehr abgefragt werden muss
+    """
+    now = now or datetime.now()
+    due_times = [next_due(order, now=now) for order in orders]
+    due_times = [due_at for due_at in due_times if due_at is not None]
+    if not due_times:
+        return None
+    return max(0.0, (min(due_times) - now).total_seconds())
@@ -0,0 +1,424 @@
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+
+from .batch import DEFAULT_RATE, DEFAULT_WORKERS
+from .client import (
+    CircuitOpenError,
+    FotoparadiesClient,
+    UnknownOrderError,
+    get_default_client,
+)
+from .fotoparadies import FotoparadiesStatus
+from .repository import OrderKey, OrderRepository
+from .transport import ORDER_INFO_PATH
+from .watch import Change, watch_changes
+
+CHANGES_PATH = "/changes"
+ORDERS_PATH = "/orders"
+# Anzahl der Statuswechsel, die neu verbundene Abonnenten nachträglich abrufen können
+CHANGE_BACKLOG = 1000
+# Nach so vielen Sekunden ohne Anfrage eines Clients wird ein Auftrag, der nicht in der
+# eigenen Ablage steht, nicht mehr abgefragt
+CLIENT_ORDER_TTL = 24 * 60 * 60
+
+
+def _payload(status: FotoparadiesStatus) -> dict:
+    """Gibt einen Auftrag in der Form einer Antwort der orderInfo-Schnittstelle zurück"""
+    updated = status.getlastupdate
+    return {
+        "orderNo": status.order,
+        "summaryStateCode": status.currentstatus,
+        "summaryDate": updated.isoformat() if updated else None,
+        "summaryPriceText": status.price,
+    }
+
+
+class ChangeFeed:
+    """
+    Thread-sichere Liste der letzten Statuswechsel mit fortlaufender Nummer.
+
+    Abonnenten warten mit ``wait_since`` auf Wechsel, die neuer sind als die zuletzt
+    gesehene Nummer.
+    """
+
+    def __init__(self, backlog: int = CHANGE_BACKLOG) -> None:
+        self._events: deque[dict] = deque(maxlen=backlog)
+        self._sequence = 0
+        self._condition = threading.Condition()
+
+    def publish(self, change: Change):
+        """Veröffentlicht einen Statuswechsel
+
+        Args:
+            change (Change): Der Wechsel
+        """
+        with self._condition:
+            self._sequence += 1
+            self._events.append({"seq": self._sequence, **change.as_dict()})
+            self._condition.notify_all()
+
+    def wait_since(self, sequence: int, timeout: Optional[float] = None) -> list[dict]:
+        """Gibt alle Wechsel nach ``sequence`` zurück und wartet, falls es noch keine gibt
+
+        Args:
+            sequence (int): Die zuletzt gesehene Nummer
+            timeout (Optional[float], optional): Maximale Wartezeit in Sekunden. Standard ist unbegrenzt.
+
+        Returns:
+            list[dict]: Die neuen Wechsel, leer nach Ablauf der Wartezeit
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence > sequence, timeout)
+            return [event for event in self._events if event["seq"] > sequence]
+
+    @property
+    def sequence(self) -> int:
+        """Nummer des letzten Wechsels
+
+        Returns:
+            int: Die Nummer, 0 falls es noch keinen gab
+        """
+        with self._condition:
+            return self._sequence
+
+
+class ClientOrders:
+    """
+    Aufträge, nach denen nur Clients gefragt haben und die nicht in der eigenen Ablage
+    stehen.
+
+    Sie liegen nur im Speicher des Servers und werden nicht in die Ablage geschrieben.
+    Hat ``ttl`` Sekunden lang kein Client mehr nach einem Auftrag gefragt, verfällt er.
+    """
+
+    def __init__(
+        self, ttl: float = CLIENT_ORDER_TTL, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.ttl = ttl
+        self._clock = clock
+        self._orders: dict[OrderKey, tuple[FotoparadiesStatus, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, shop: int, order: int) -> Optional[FotoparadiesStatus]:
+        """Gibt einen Auftrag zurück und merkt sich die Anfrage
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            Optional[FotoparadiesStatus]: Der Auftrag oder None, falls er unbekannt oder verfallen ist
+        """
+        with self._lock:
+            self._expire()
+            entry = self._orders.get((shop, order))
+            if entry is None:
+                return None
+            self._orders[(shop, order)] = (entry[0], self._clock())
+            return entry[0]
+
+    def add(self, status: FotoparadiesStatus) -> bool:
+        """Nimmt einen Auftrag auf, falls er noch nicht bekannt ist
+
+        Args:
+            status (FotoparadiesStatus): Der Auftrag
+
+        Returns:
+            bool: True, falls der Auftrag neu ist
+        """
+        key = (status._shop, status._order)
+        with self._lock:
+            if key in self._orders:
+                return False
+            self._orders[key] = (status, self._clock())
+            return True
+
+    def discard(self, key: OrderKey):
+        """Vergisst einen Auftrag, z.B. weil er inzwischen in der eigenen Ablage steht
+
+        Args:
+            key (OrderKey): Filial- und Auftragsnummer
+        """
+        with self._lock:
+            self._orders.pop(key, None)
+
+    def owns(self, status: FotoparadiesStatus) -> bool:
+        """Prüft, ob der Auftrag genau dieses Objekt aus der Liste der Clients ist
+
+        Args:
+            status (FotoparadiesStatus): Der Auftrag
+
+        Returns:
+            bool: True, falls er nur für Clients abgefragt wird
+        """
+        with self._lock:
+            entry = self._orders.get((status._shop, status._order))
+            return entry is not None and entry[0] is status
+
+    def all(self) -> list[FotoparadiesStatus]:
+        """Gibt alle noch nicht verfallenen Aufträge zurück
+
+        Returns:
+            list[FotoparadiesStatus]: Die Aufträge
+        """
+        with self._lock:
+            self._expire()
+            return [status for status, _ in self._orders.values()]
+
+    def _expire(self):
+        deadline = self._clock() - self.ttl
+        for key in [key for key, (_, asked) in self._orders.items() if asked < deadline]:
+            del self._orders[key]
+
+
+class _PolledOrders:
+    """Eigene Aufträge und die der Clients, so wie sie ``watch_changes`` abfragt"""
+
+    def __init__(self, repository: OrderRepository, client_orders: ClientOrders) -> None:
+        self.repository = repository
+        self.client_orders = client_orders
+
+    def all(self) -> list[FotoparadiesStatus]:
+        orders = self.repository.all()
+        own = {(status._shop, status._order) for status in orders}
+        for status in self.client_orders.all():
+            key = (status._shop, status._order)
+            if key in own:
+                # Inzwischen auch in der eigenen Ablage, dort wird er weiter abgefragt
+                self.client_orders.discard(key)
+            else:
+                orders.append(status)
+        return orders
+
+    def save_status(self, statuses: list[FotoparadiesStatus]):
+        # Aufträge der Clients bleiben nur im Speicher
+        self.repository.save_status(
+            [status for status in statuses if not self.client_orders.owns(status)]
+        )
+
+
+class _Stopped(Exception):
+    pass
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    server: "StatusServer"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path == ORDER_INFO_PATH:
+            self._order_info(query)
+        elif url.path == ORDERS_PATH:
+            orders = self.server.repository.all()
+            self._send(200, [order.as_dict() for order in orders])
+        elif url.path == CHANGES_PATH:
+            self._changes(query)
+        else:
+            self._send(404, {"status": 404})
+
+    def _order_info(self, query: dict[str, list[str]]):
+        try:
+            shop = int(query["shop"][0])
+            order = int(query["order"][0])
+            config = int(query.get("config", ["1320"])[0])
+        except (KeyError, ValueError):
+            self._send(400, {"status": 400})
+            return
+        self._send(*self.server.order_info(shop, order, config))
+
+    def _changes(self, query: dict[str, list[str]]):
+        """Streamt Statuswechsel als NDJSON, bis der Client die Verbindung trennt"""
+        try:
+            sequence = int(query["since"][0]) if "since" in query else None
+        except ValueError:
+            self._send(400, {"status": 400})
+            return
+        feed = self.server.changes
+        if sequence is None:
+            sequence = feed.sequence
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while not self.server.stopping.is_set():
+                events = feed.wait_since(sequence, timeout=1.0)
+                for event in events:
+                    line = json.dumps(event, ensure_ascii=False) + "\n"
+                    self.wfile.write(line.encode("utf-8"))
+                    sequence = event["seq"]
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
+
+    def _send(self, status: int, body):
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keine Ausgabe pro Anfrage
+        pass
+
+
+class StatusServer(ThreadingHTTPServer):
+    """
+    Lokaler Server, der die Aufträge für beliebig viele CLI- und GUI-Instanzen abfragt.
+
+    Der Server besitzt die Auftragsablage und den Abfrageplan: Ein Hintergrund-Thread
+    fragt fällige Aufträge bei der echten API ab, alle Clients bekommen den
+    zwischengespeicherten Stand über eine zur API kompatible orderInfo-Schnittstelle
+    (``--base-url``). Die Last auf der API hängt damit nicht von der Zahl der Clients ab.
+    Fragt ein Client nach einem Auftrag, der nicht in der eigenen Ablage steht, wird er
+    nur im Speicher mit überwacht, bis länger kein Client mehr nach ihm gefragt hat.
+
+    Zusätzlich liefert ``/orders`` alle Aufträge als JSON und ``/changes`` einen
+    NDJSON-Strom der Statuswechsel (mit ``?since=<seq>`` ab einer bestimmten Nummer).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        repository: Optional[OrderRepository] = None,
+        client: Optional[FotoparadiesClient] = None,
+        rate: float = DEFAULT_RATE,
+        max_workers: int = DEFAULT_WORKERS,
+        client_order_ttl: float = CLIENT_ORDER_TTL,
+    ) -> None:
+        """Initialisiert den Server
+
+        Args:
+            host (str, optional): Adresse, an die der Server gebunden wird. Standard ist 127.0.0.1.
+            port (int, optional): Port des Servers, 0 wählt einen freien Port. Standard ist 0.
+            repository (Optional[OrderRepository], optional): Die Aufträge. Standard ist ein Zwischenspeicher der geteilten Ablage.
+            client (Optional[FotoparadiesClient], optional): Client für die echte API. Standard ist der geteilte Client.
+            rate (float, optional): Maximale Anzahl Anfragen pro Sekunde an die API. Standard ist DEFAULT_RATE.
+            max_workers (int, optional): Maximale Anzahl gleichzeitiger Anfragen an die API. Standard ist DEFAULT_WORKERS.
+            client_order_ttl (float, optional): Sekunden ohne Anfrage, nach denen Aufträge der Clients verfallen. Standard ist CLIENT_ORDER_TTL.
+        """
+        super().__init__((host, port), _StatusHandler)
+        self.repository = repository if repository is not None else OrderRepository()
+        self.client_orders = ClientOrders(ttl=client_order_ttl)
+        self.client = client if client is not None else get_default_client()
+        self.rate = rate
+        self.max_workers = max_workers
+        self.changes = ChangeFeed()
+        self.stopping = threading.Event()
+        self._wake = threading.Event()
+        self._poller: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """Basis-URL, unter der der Server erreichbar ist
+
+        Returns:
+            str: Die Basis-URL, z.B. für ``--base-url``
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def order_info(self, shop: int, order: int, config: int) -> tuple[int, dict]:
+        """Beantwortet eine orderInfo-Anfrage, möglichst aus dem Zwischenspeicher
+
+        Bisher unbekannte Aufträge werden einmalig bei der API abgefragt und danach vom
+        Server mit überwacht, ohne sie in die eigene Ablage aufzunehmen.
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+            config (int): Abfragekonfiguration
+
+        Returns:
+            tuple[int, dict]: HTTP-Status und Antwort
+        """
+        status = self.repository.get(shop, order)
+        if status is None:
+            status = self.client_orders.get(shop, order)
+        if (
+            status is not None
+            and status.fetched_at is not None
+            and status.currentstatus != "ERROR"
+        ):
+            return 200, _payload(status)
+
+        # Der Client bringt Cache und gebündelte Anfragen mit, gleichzeitige Anfragen
+        # mehrerer Clients nach demselben Auftrag erreichen die API nur einmal
+        try:
+            payload = self.client.get_status(shop=shop, order=order, config=config)
+        except UnknownOrderError:
+            return 404, {"status": 404}
+        except CircuitOpenError:
+            return 503, {"status": 503}
+        except (requests.RequestException, ValueError):
+            return 502, {"status": 502}
+
+        if status is None:
+            # Ab jetzt fragt der Hintergrund-Thread den Auftrag planmäßig ab. Die erste
+            # Abfrage kommt dabei aus dem Cache des Clients.
+            if self.client_orders.add(FotoparadiesStatus(shop, order, fetch_data=False)):
+                self._wake.set()
+        return 200, payload
+
+    def _poll(self):
+        def sleep(seconds: float):
+            # Neue Aufträge und das Beenden wecken die Abfrage vorzeitig auf
+            self._wake.wait(seconds)
+            self._wake.clear()
+            if self.stopping.is_set():
+                raise _Stopped
+
+        try:
+            for change in watch_changes(
+                _PolledOrders(self.repository, self.client_orders),
+                self.client,
+                rate=self.rate,
+                max_workers=self.max_workers,
+                sleep=sleep,
+            ):
+                self.changes.publish(change)
+        except _Stopped:
+            pass
+
+    def start_polling(self) -> threading.Thread:
+        """Startet die planmäßige Abfrage der Aufträge in einem Hintergrund-Thread
+
+        Returns:
+            threading.Thread: Der Thread der Abfrage
+        """
+        if self._poller is None:
+            self._poller = threading.Thread(target=self._poll, daemon=True)
+            self._poller.start()
+        return self._poller
+
+    def start_background(self) -> threading.Thread:
+        """Startet Abfrage und Server in Hintergrund-Threads
+
+        Returns:
+            threading.Thread: Der Thread, in dem der Server läuft
+        """
+        self.start_polling()
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def server_close(self):
+        self.stopping.set()
+        self._wake.set()
+        super().server_close()
+        self.repository.flush()
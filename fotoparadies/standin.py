@@ -0,0 +1,163 @@
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Union
+from urllib.parse import parse_qs, urlsplit
+
+from .transport import ORDER_INFO_PATH
+
+# Reihenfolge, in der ein simulierter Auftrag seine Stati durchläuft
+STATES = ("PROCESSING", "READY", "DELIVERED")
+
+
+class StandInState:
+    """
+    Simulierter Zustand der Fotoparadies API für den lokalen Ersatzserver.
+
+    Jeder Auftrag beginnt beim ersten Abruf mit dem ersten Status aus ``STATES`` und
+    wechselt alle ``transition_seconds`` Sekunden in den nächsten.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        unknown_rate: float = 0.0,
+        transition_seconds: float = 60.0,
+    ) -> None:
+        """Initialisiert den simulierten Zustand
+
+        Args:
+            latency (float, optional): Feste Antwortzeit in Sekunden. Standard ist 0.
+            jitter (float, optional): Zufällige zusätzliche Antwortzeit in Sekunden. Standard ist 0.
+            error_rate (float, optional): Anteil der Anfragen, die mit 503 beantwortet werden. Standard ist 0.
+            unknown_rate (float, optional): Anteil der Aufträge, die mit 404 als unbekannt gelten. Standard ist 0.
+            transition_seconds (float, optional): Dauer eines Status in Sekunden. Standard ist 60.
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.unknown_rate = unknown_rate
+        self.transition_seconds = transition_seconds
+
+        self.requests = 0
+        self._first_seen: dict[tuple[int, int], datetime] = {}
+        self._lock = threading.Lock()
+
+    def respond(
+        self, shop: int, order: int
+    ) -> tuple[int, Optional[dict[str, Union[str, int]]]]:
+        """Erzeugt die Antwort für einen Auftrag
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            tuple[int, Optional[dict[str, Union[str, int]]]]: HTTP-Status und Antwort
+        """
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        with self._lock:
+            self.requests += 1
+            first_seen = self._first_seen.setdefault((shop, order), datetime.now())
+
+        if random.random() < self.error_rate:
+            return 503, None
+
+        # Ob ein Auftrag unbekannt ist und was er kostet, hängt nur von Shop und
+        # Auftragsnummer ab, damit wiederholte Abfragen konsistent bleiben
+        order_random = random.Random(f"{shop}:{order}")
+        if order_random.random() < self.unknown_rate:
+            return 404, None
+
+        elapsed = (datetime.now() - first_seen).total_seconds()
+        step = min(int(elapsed // self.transition_seconds), len(STATES) - 1)
+        changed_at = first_seen + timedelta(seconds=step * self.transition_seconds)
+        price = order_random.randint(100, 5000)
+        return 200, {
+            "orderNo": order,
+            "summaryStateCode": STATES[step],
+            "summaryDate": changed_at.isoformat(timespec="seconds"),
+            "summaryPriceText": f"{price // 100},{price % 100:02d} €",
+        }
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    server: "StandInServer"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != ORDER_INFO_PATH:
+            self._send(404, None)
+            return
+
+        query = parse_qs(url.query)
+        try:
+            shop = int(query["shop"][0])
+            order = int(query["order"][0])
+        except (KeyError, ValueError):
+            self._send(400, None)
+            return
+
+        self._send(*self.server.state.respond(shop, order))
+
+    def _send(self, status: int, body: Optional[dict]):
+        payload = json.dumps(body if body is not None else {"status": status})
+        data = payload.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # Keine Ausgabe pro Anfrage, das würde Lasttests verfälschen
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Lokaler HTTP-Server, der ``/spotapi/orderInfo/forShop`` simuliert.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 0, state: Optional[StandInState] = None
+    ) -> None:
+        """Initialisiert den Server
+
+        Args:
+            host (str, optional): Adresse, an die der Server gebunden wird. Standard ist 127.0.0.1.
+            port (int, optional): Port des Servers, 0 wählt einen freien Port. Standard ist 0.
+            state (Optional[StandInState], optional): Simulierter Zustand. Standard ist ohne Verzögerung und Fehler.
+        """
+        super().__init__((host, port), _StandInHandler)
+        self.state = state or StandInState()
+
+    @property
+    def base_url(self) -> str:
+        """Basis-URL, unter der der Server erreichbar ist
+
+        Returns:
+            str: Die Basis-URL, z.B. für ``--base-url``
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start_background(self) -> threading.Thread:
+        """Startet den Server in einem Hintergrund-Thread
+
+        Returns:
+            threading.Thread: Der Thread, in dem der Server läuft
+        """
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,505 @@
+import pickle
+import sqlite3
+import threading
+import warnings
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+from platformdirs import user_config_dir
+
+from .fotoparadies import FotoparadiesStatus
+from .locking import file_lock
+from .metrics import span
+from .query import OrderQuery
+
+# Die Spalten entsprechen in ihrer Reihenfolge FotoparadiesStatus.__slots__
+_COLUMNS = (
+    "shop",
+    "order_no",
+    "name",
+    "state",
+    "updated",
+    "price",
+    "fetched_at",
+    "failed_at",
+    "failures",
+    "last_error",
+)
+_DATE_COLUMNS = (4, 6, 7)  # updated, fetched_at, failed_at
+_INSERT = (
+    f"INSERT INTO orders ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
+_UPSERT = _INSERT + " ON CONFLICT (shop, order_no) DO UPDATE SET " + ", ".join(
+    f"{column} = excluded.{column}" for column in _COLUMNS[2:]
+)
+# Beim Übernehmen der Pickle-Datei gewinnt ein bereits vorhandener Auftrag
+_INSERT_KEEP = _INSERT + " ON CONFLICT (shop, order_no) DO NOTHING"
+_UPDATE_STATUS = (
+    "UPDATE orders SET "
+    + ", ".join(f"{column} = ?" for column in _COLUMNS[3:])
+    + " WHERE shop = ? AND order_no = ?"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    shop INTEGER NOT NULL,
+    order_no INTEGER NOT NULL,
+    name TEXT,
+    state TEXT,
+    updated TEXT,
+    price TEXT,
+    fetched_at TEXT,
+    failed_at TEXT,
+    failures INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    PRIMARY KEY (shop, order_no)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS orders_name ON orders (name);
+CREATE INDEX IF NOT EXISTS orders_state ON orders (state);
+CREATE INDEX IF NOT EXISTS orders_order_no ON orders (order_no);
+CREATE INDEX IF NOT EXISTS orders_updated ON orders (updated);
+-- Nach der Filiale wird über den Primärschlüssel (shop, order_no) gesucht
+
+-- Append-only Verlauf der Statuswechsel, befüllt von den Triggern unten.
+-- Geschrieben wird nur, wenn sich state oder updated tatsächlich ändern.
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY,
+    shop INTEGER NOT NULL,
+    order_no INTEGER NOT NULL,
+    state TEXT,
+    updated TEXT,
+    recorded_at TEXT NOT NULL
+        DEFAULT (strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime'))
+);
+CREATE INDEX IF NOT EXISTS history_order ON history (shop, order_no, id);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+
+CREATE TRIGGER IF NOT EXISTS history_insert AFTER INSERT ON orders
+WHEN new.state IS NOT NULL
+BEGIN
+    INSERT INTO history (shop, order_no, state, updated)
+    VALUES (new.shop, new.order_no, new.state, new.updated);
+END;
+CREATE TRIGGER IF NOT EXISTS history_update AFTER UPDATE OF state, updated ON orders
+WHEN new.state IS NOT old.state OR new.updated IS NOT old.updated
+BEGIN
+    INSERT INTO history (shop, order_no, state, updated)
+    VALUES (new.shop, new.order_no, new.state, new.updated);
+END;
+"""
+
+
+def app_config_path() -> Path:
+    """Gibt den Ordner zurück, in dem die Aufträge abgelegt werden.
+    Der Pfad ist abhängig vom Betriebssystem. Der Ordner wird angelegt, falls er nicht existiert.
+
+    Returns:
+        Path: Der Ordner für die Auftragsdaten
+    """
+    app_path = Path(user_config_dir(appname="fotoparadies-status", appauthor="hija"))
+    app_path.mkdir(parents=True, exist_ok=True)
+    return app_path
+
+
+def default_store_path() -> Path:
+    """Gibt den Pfad der SQLite-Datenbank mit den Aufträgen zurück
+
+    Returns:
+        Path: Der Pfad der Datenbank
+    """
+    return app_config_path() / "orders.sqlite3"
+
+
+def legacy_pickle_path() -> Path:
+    """Gibt den Pfad zurück, an dem frühere Versionen die Aufträge als Pickle-Datei abgelegt haben
+
+    Returns:
+        Path: Der Pfad der Pickle-Datei
+    """
+    return app_config_path() / "orders.pkl"
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _to_row(status: FotoparadiesStatus) -> tuple:
+    state = list(status.__getstate__())
+    for index in _DATE_COLUMNS:
+        state[index] = _to_text(state[index])
+    # Leere Namen zählen als "kein Name", damit der eindeutige Index nicht greift
+    state[2] = state[2] or None
+    return tuple(state)
+
+
+def _from_row(row: tuple) -> FotoparadiesStatus:
+    state = list(row)
+    for index in _DATE_COLUMNS:
+        if state[index] is not None:
+            state[index] = datetime.fromisoformat(state[index])
+    status = FotoparadiesStatus.__new__(FotoparadiesStatus)
+    status.__setstate__(tuple(state))
+    return status
+
+
+class OrderStore:
+    """
+    Persistente Ablage der Aufträge in einer SQLite-Datenbank.
+
+    Jeder Auftrag ist eine Zeile mit Primärschlüssel (Filiale, Auftragsnummer), sodass
+    Hinzufügen, Löschen und Aktualisieren einzelner Aufträge nur die betroffene Zeile
+    schreibt, statt die gesamte Liste neu zu speichern.
+
+    Die Datenbank läuft im WAL-Modus: Beliebig viele Prozesse (GUI, CLI, Cronjobs)
+    können gleichzeitig lesen, geschrieben wird exklusiv in kurzen Transaktionen.
+    Ein Prozess, der auf die Schreibsperre trifft, wartet bis zu ``timeout`` Sekunden.
+
+    Jeder Statuswechsel wird per Trigger in der Tabelle ``history`` festgehalten,
+    siehe ``StatusHistory``.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        legacy_path: Optional[Path] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        """Öffnet die Datenbank und übernimmt bei Bedarf eine vorhandene Pickle-Datei
+
+        Args:
+            path (Optional[Path], optional): Pfad der Datenbank. Standard ist default_store_path().
+            legacy_path (Optional[Path], optional): Pfad einer zu übernehmenden Pickle-Datei. Standard ist legacy_pickle_path().
+            timeout (float, optional): Maximale Wartezeit auf die Schreibsperre in Sekunden. Standard ist 30.
+        """
+        self.path = Path(path) if path is not None else default_store_path()
+        self._lock = threading.RLock()
+        # Transaktionen werden in transaction() selbst gesteuert
+        self._conn = sqlite3.connect(
+            self.path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+        if legacy_path is None and path is None:
+            legacy_path = legacy_pickle_path()
+        if legacy_path is not None:
+            self._migrate_pickle(Path(legacy_path))
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Schreibende Transaktion, die die Schreibsperre sofort beim Beginn anfordert.
+        Bei einer Ausnahme wird alles zurückgenommen.
+
+        Yields:
+            Iterator[sqlite3.Connection]: Die Verbindung, exklusiv für diesen Thread
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _migrate_pickle(self, legacy_path: Path) -> list[tuple[FotoparadiesStatus, str]]:
+        """Übernimmt die Aufträge aus der Pickle-Datei früherer Versionen.
+
+        Frühere Versionen haben doppelte Namen zugelassen. Solche Aufträge werden nicht
+        verworfen, sondern bekommen einen Namen mit Zusatz, z.B. "urlaub (2)". Die
+        Pickle-Datei wird erst umbenannt, wenn alle Aufträge übernommen wurden.
+
+        Args:
+            legacy_path (Path): Pfad der Pickle-Datei
+
+        Returns:
+            list[tuple[FotoparadiesStatus, str]]: Umbenannte Aufträge und ihr neuer Name
+        """
+        if not legacy_path.exists():
+            return []
+        # Startet ein zweiter Prozess gleichzeitig, darf nur einer übernehmen
+        with file_lock(legacy_path):
+            if not legacy_path.exists():
+                return []
+            with open(legacy_path, "rb") as file:
+                orders = pickle.load(file)
+
+            renamed = []
+            # Schlägt eine Zeile fehl, wird die ganze Übernahme zurückgerollt
+            with self.transaction() as conn:
+                for order in orders:
+                    row = _to_row(order)
+                    shop, order_no, name = row[:3]
+                    if name is not None and conn.execute(
+                        "SELECT 1 FROM orders WHERE name = ?"
+                        " AND NOT (shop = ? AND order_no = ?)",
+                        (name, shop, order_no),
+                    ).fetchone():
+                        new_name = self._free_name(conn, name)
+                        row = (shop, order_no, new_name) + row[3:]
+                        renamed.append((order, new_name))
+                    conn.execute(_INSERT_KEEP, row)
+
+            for order, new_name in renamed:
+                warnings.warn(
+                    f"Der Name {order.ordername} ist doppelt vergeben, der Auftrag "
+                    f"{order._order} in Filiale {order._shop} heißt jetzt {new_name}",
+                    stacklevel=2,
+                )
+            # Die Pickle-Datei bleibt als Sicherung erhalten, wird aber nicht erneut eingelesen
+            legacy_path.replace(legacy_path.with_name(legacy_path.name + ".migrated"))
+            return renamed
+
+    @staticmethod
+    def _free_name(conn: sqlite3.Connection, name: str) -> str:
+        """Gibt den ersten freien Namen der Form "<name> (2)", "<name> (3)", ... zurück"""
+        suffix = 2
+        while conn.execute(
+            "SELECT 1 FROM orders WHERE name = ?", (f"{name} ({suffix})",)
+        ).fetchone():
+            suffix += 1
+        return f"{name} ({suffix})"
+
+    def _select(
+        self, where: str = "", parameters: tuple = ()
+    ) -> list[FotoparadiesStatus]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM orders {where} ORDER BY rowid",
+                parameters,
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def all(self) -> list[FotoparadiesStatus]:
+        """Gibt alle Aufträge in der Reihenfolge zurück, in der sie hinzugefügt wurden
+
+        Returns:
+            list[FotoparadiesStatus]: Alle Aufträge
+        """
+        with span("store_load"):
+            return self._select()
+
+    def get(self, shop: int, order: int) -> Optional[FotoparadiesStatus]:
+        """Sucht einen Auftrag anhand von Filiale und Auftragsnummer
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            Optional[FotoparadiesStatus]: Der Auftrag oder None
+        """
+        found = self._select("WHERE shop = ? AND order_no = ?", (shop, order))
+        return found[0] if found else None
+
+    def find_by_name(self, name: str) -> Optional[FotoparadiesStatus]:
+        """Sucht einen Auftrag anhand seines Namens (benutzerdefiniert oder Auftragsnummer)
+
+        Args:
+            name (str): Der Name des Auftrags
+
+        Returns:
+            Optional[FotoparadiesStatus]: Der Auftrag oder None
+        """
+        found = self._select("WHERE name = ?", (name,))
+        if not found and name.isdigit():
+            # Aufträge ohne eigenen Namen heißen wie ihre Auftragsnummer
+            found = self._select("WHERE name IS NULL AND order_no = ?", (int(name),))
+        return found[0] if found else None
+
+    def add(self, status: FotoparadiesStatus) -> bool:
+        """Fügt einen Auftrag hinzu
+
+        Args:
+            status (FotoparadiesStatus): Der neue Auftrag
+
+        Returns:
+            bool: False, falls es den Auftrag oder seinen Namen bereits gibt
+        """
+        try:
+            with self.transaction() as conn:
+                conn.execute(_INSERT, _to_row(status))
+        except sqlite3.IntegrityError:
+            return False
+        return True
+
+    def add_many(
+        self, statuses: Iterable[FotoparadiesStatus]
+    ) -> list[FotoparadiesStatus]:
+        """Fügt viele Aufträge in einer Transaktion hinzu.
+
+        Doppelte Aufträge und Namen werden über Hash-Mengen erkannt, sowohl gegenüber dem
+        Bestand als auch innerhalb der übergebenen Aufträge, und übersprungen.
+
+        Args:
+            statuses (Iterable[FotoparadiesStatus]): Die neuen Aufträge
+
+        Returns:
+            list[FotoparadiesStatus]: Die tatsächlich hinzugefügten Aufträge
+        """
+        with self.transaction() as conn:
+            keys = set()
+            names = set()
+            for shop, order, name in conn.execute(
+                "SELECT shop, order_no, name FROM orders"
+            ):
+                keys.add((shop, order))
+                if name is not None:
+                    names.add(name)
+
+            added = []
+            for status in statuses:
+                key = (status._shop, status._order)
+                if key in keys or (status._name and status._name in names):
+                    continue
+                keys.add(key)
+                if status._name:
+                    names.add(status._name)
+                added.append(status)
+
+            conn.executemany(_INSERT, (_to_row(status) for status in added))
+        return added
+
+    def save_status(self, statuses: Iterable[FotoparadiesStatus]):
+        """Schreibt nur die abgefragten Statusfelder der Aufträge zurück.
+
+        Name und Existenz eines Auftrags bleiben unberührt, sodass ein zwischenzeitlich
+        gelöschter oder umbenannter Auftrag nicht überschrieben wird.
+
+        Args:
+            statuses (Iterable[FotoparadiesStatus]): Die aktualisierten Aufträge
+        """
+        rows = (_to_row(status) for status in statuses)
+        with span("store_save"), self.transaction() as conn:
+            conn.executemany(_UPDATE_STATUS, (row[3:] + row[:2] for row in rows))
+
+    def delete(self, shop: int, order: int) -> bool:
+        """Löscht einen Auftrag
+
+        Args:
+            shop (int): Filialnummer
+            order (int): Auftragsnummer
+
+        Returns:
+            bool: True, falls ein Auftrag gelöscht wurde
+        """
+        with self.transaction() as conn:
+            cursor = conn.execute(
+                "DELETE FROM orders WHERE shop = ? AND order_no = ?", (shop, order)
+            )
+        return cursor.rowcount > 0
+
+    def find(self, query: OrderQuery) -> list[FotoparadiesStatus]:
+        """Sucht alle Aufträge, auf die der Filter passt
+
+        Args:
+            query (OrderQuery): Der Filter
+
+        Returns:
+            list[FotoparadiesStatus]: Die passenden Aufträge in der Reihenfolge, in der sie hinzugefügt wurden
+        """
+        return self._select(*query.where())
+
+    def delete_matching(self, query: OrderQuery) -> list[FotoparadiesStatus]:
+        """Löscht alle Aufträge, auf die der Filter passt
+
+        Args:
+            query (OrderQuery): Der Filter
+
+        Raises:
+            ValueError: Wenn der Filter leer ist und damit alle Aufträge löschen würde
+
+        Returns:
+            list[FotoparadiesStatus]: Die gelöschten Aufträge
+        """
+        if not query:
+            raise ValueError("Ein leerer Filter würde alle Aufträge löschen")
+        where, parameters = query.where()
+        with self.transaction() as conn:
+            deleted = self._select(where, parameters)
+            conn.execute(f"DELETE FROM orders {where}", parameters)
+        return deleted
+
+    def delete_by_state(self, state: str) -> list[FotoparadiesStatus]:
+        """Löscht alle Aufträge mit einem bestimmten Status
+
+        Args:
+            state (str): Der Status, z.B. DELIVERED
+
+        Returns:
+            list[FotoparadiesStatus]: Die gelöschten Aufträge
+        """
+        return self.delete_matching(OrderQuery(states=(state,)))
+
+    def replace_all(self, statuses: Iterable[FotoparadiesStatus]):
+        """Ersetzt den gesamten Bestand durch die übergebenen Aufträge
+
+        Args:
+            statuses (Iterable[FotoparadiesStatus]): Die Aufträge, die erhalten bleiben sollen
+        """
+        statuses = list(statuses)
+        with span("store_save"), self.transaction() as conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS keep (shop, order_no)")
+            conn.execute("DELETE FROM keep")
+            conn.executemany(
+                "INSERT INTO keep VALUES (?, ?)",
+                ((status._shop, status._order) for status in statuses),
+            )
+            conn.execute(
+                "DELETE FROM orders WHERE NOT EXISTS (SELECT 1 FROM keep "
+                "WHERE keep.shop = orders.shop AND keep.order_no = orders.order_no)"
+            )
+            conn.executemany(_UPSERT, (_to_row(status) for status in statuses))
+
+    def query(self, sql: str, parameters: tuple = ()) -> list[tuple]:
+        """Führt eine lesende Abfrage aus, z.B. auf den Verlauf
+
+        Args:
+            sql (str): Die Abfrage
+            parameters (tuple, optional): Parameter der Abfrage. Standard sind keine.
+
+        Returns:
+            list[tuple]: Alle Zeilen des Ergebnisses
+        """
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchall()
+
+    def data_version(self) -> int:
+        """Gibt einen Zähler zurück, der sich ändert, sobald ein anderer Prozess (oder eine
+        andere Verbindung) Änderungen an der Datenbank gespeichert hat
+
+        Returns:
+            int: Der aktuelle Stand der Datenbank
+        """
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0]
+
+    def close(self):
+        """Schließt die Datenbank"""
+        with self._lock:
+            self._conn.close()
+
+
+_default_store: Optional[OrderStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> OrderStore:
+    """Gibt die gemeinsam genutzte Auftragsablage zurück und öffnet sie bei Bedarf.
+
+    Returns:
+        OrderStore: Die prozessweit geteilte Auftragsablage
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = OrderStore()
+        return _default_store
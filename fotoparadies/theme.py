@@ -0,0 +1,192 @@
+from functools import lru_cache
+from typing import NamedTuple
+
+from PyQt6.QtGui import QColor, QPalette
+
+
+class Theme(NamedTuple):
+    """
+    Farben eines Farbschemas der GUI.
+
+    Fenster, Titel und Listen bekommen ihre Farben über die Palette, nur Eingabefelder,
+    Schaltflächen und die Schaltflächen der Karten werden per Stylesheet gestaltet.
+    """
+
+    name: str
+    dark: bool
+    window: str  # Hintergrund des Fensters und der Auftragsliste
+    text: str
+    field: str  # Hintergrund von Eingabefeldern
+    field_border: str
+    button: str
+    button_hover: str
+    button_pressed: str
+    button_border: str
+    delete: str
+    delete_hover: str
+    delete_pressed: str
+    delete_border: str
+    delete_text: str
+
+
+LIGHT = Theme(
+    name="light",
+    dark=False,
+    window="#FFFFFF",
+    text="#000000",
+    field="#FFFFFF",
+    field_border="#E5E5E5",
+    button="rgba(0, 0, 0, 0.03)",
+    button_hover="rgba(0, 0, 0, 0.05)",
+    button_pressed="rgba(0, 0, 0, 0.02)",
+    button_border="rgba(0, 0, 0, 0.06)",
+    delete="rgba(255, 0, 0, 0.05)",
+    delete_hover="rgba(255, 0, 0, 0.08)",
+    delete_pressed="rgba(255, 0, 0, 0.03)",
+    delete_border="rgba(255, 0, 0, 0.1)",
+    delete_text="#C42B1C",
+)
+
+DARK = Theme(
+    name="dark",
+    dark=True,
+    window="#202020",
+    text="#FFFFFF",
+    field="#2D2D2D",
+    field_border="#404040",
+    button="rgba(255, 255, 255, 0.06)",
+    button_hover="rgba(255, 255, 255, 0.08)",
+    button_pressed="rgba(255, 255, 255, 0.04)",
+    button_border="rgba(255, 255, 255, 0.1)",
+    delete="rgba(255, 0, 0, 0.1)",
+    delete_hover="rgba(255, 0, 0, 0.15)",
+    delete_pressed="rgba(255, 0, 0, 0.08)",
+    delete_border="rgba(255, 0, 0, 0.2)",
+    delete_text="#FF99A4",
+)
+
+THEMES = {False: LIGHT, True: DARK}
+
+# Eingabefelder und Schaltflächen, {accent} ist die Akzentfarbe des Systems
+_CONTROLS = """
+QLineEdit, QComboBox {{
+    padding: 8px;
+    border: 1px solid {field_border};
+    border-radius: 4px;
+    background: {field};
+    color: {text};
+}}
+QComboBox::drop-down {{
+    border: none;
+    padding-right: 8px;
+}}
+QComboBox::down-arrow {{
+    image: none;
+    border: none;
+}}
+QLineEdit:focus, QComboBox:focus {{
+    border: 1px solid {accent};
+}}
+QPushButton {{
+    padding: 8px 16px;
+    border-radius: 4px;
+    background: {button};
+    color: {text};
+    border: 1px solid {button_border};
+}}
+QPushButton:hover {{
+    background: {button_hover};
+}}
+QPushButton:pressed {{
+    background: {button_pressed};
+}}
+QPushButton#primary {{
+    background: {accent};
+    border: 1px solid {accent};
+    color: white;
+}}
+"""
+
+# Schaltflächen auf den Auftragskarten
+_CARDS = """
+QPushButton#deleteButton {{
+    padding: 8px 16px;
+    border-radius: 4px;
+    background: {delete};
+    border: 1px solid {delete_border};
+    color: {delete_text};
+}}
+QPushButton#deleteButton:hover {{
+    background: {delete_hover};
+}}
+QPushButton#deleteButton:pressed {{
+    background: {delete_pressed};
+}}
+QPushButton#browserButton {{
+    border: none;
+    background: transparent;
+    padding: 0px;
+}}
+"""
+
+_CARD_STYLESHEETS = {theme: _CARDS.format(**theme._asdict()) for theme in (LIGHT, DARK)}
+
+
+def detect_theme(palette: QPalette) -> Theme:
+    """Erkennt anhand der Palette, ob das System ein helles oder dunkles Farbschema nutzt
+
+    Args:
+        palette (QPalette): Palette der Anwendung
+
+    Returns:
+        Theme: LIGHT oder DARK
+    """
+    return THEMES[palette.window().color().lightness() <= 128]
+
+
+@lru_cache(maxsize=8)
+def controls_stylesheet(theme: Theme, accent: str) -> str:
+    """Stylesheet für Eingabefelder und Schaltflächen, je Akzentfarbe nur einmal erzeugt
+
+    Args:
+        theme (Theme): Das Farbschema
+        accent (str): Akzentfarbe des Systems, z.B. #0078D4
+
+    Returns:
+        str: Das Stylesheet
+    """
+    return _CONTROLS.format(accent=accent, **theme._asdict())
+
+
+def cards_stylesheet(theme: Theme) -> str:
+    """Stylesheet für die Schaltflächen der Auftragskarten
+
+    Args:
+        theme (Theme): Das Farbschema
+
+    Returns:
+        str: Das Stylesheet
+    """
+    return _CARD_STYLESHEETS[theme]
+
+
+def theme_palette(theme: Theme) -> QPalette:
+    """Palette mit den Fenster- und Textfarben eines Farbschemas. Alle übrigen Farben
+    bleiben offen und werden von der Palette der Anwendung übernommen.
+
+    Args:
+        theme (Theme): Das Farbschema
+
+    Returns:
+        QPalette: Die Palette
+    """
+    palette = QPalette()
+    for role, color in (
+        (QPalette.ColorRole.Window, theme.window),
+        (QPalette.ColorRole.WindowText, theme.text),
+        (QPalette.ColorRole.Base, theme.field),
+        (QPalette.ColorRole.Text, theme.text),
+        (QPalette.ColorRole.ButtonText, theme.text),
+    ):
+        palette.setColor(role, QColor(color))
+    return palette
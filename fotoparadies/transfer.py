@@ -0,0 +1,110 @@
+import csv
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, TextIO
+
+from .fotoparadies import FotoparadiesStatus
+
+FORMATS = ("csv", "jsonl")
+_FIELDS = ("shop", "order", "name")
+_SUFFIXES = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl"}
+
+
+class TransferError(ValueError):
+    """Eine Zeile der Import-Datei ist ungültig"""
+
+
+def detect_format(path: Path, fmt: Optional[str] = None) -> str:
+    """Bestimmt das Dateiformat anhand der Angabe oder der Dateiendung
+
+    Args:
+        path (Path): Die Datei
+        fmt (Optional[str], optional): Ausdrücklich gewähltes Format (csv oder jsonl)
+
+    Raises:
+        TransferError: Wenn sich das Format nicht bestimmen lässt
+
+    Returns:
+        str: csv oder jsonl
+    """
+    if fmt is not None:
+        if fmt not in FORMATS:
+            raise TransferError(f"Unbekanntes Format: {fmt}")
+        return fmt
+    try:
+        return _SUFFIXES[Path(path).suffix.lower()]
+    except KeyError:
+        raise TransferError(
+            f"Format von {path} unbekannt, bitte csv oder jsonl angeben"
+        ) from None
+
+
+def _to_status(record: dict, line: int) -> FotoparadiesStatus:
+    try:
+        shop = int(record["shop"])
+        order = int(record["order"])
+    except (KeyError, TypeError, ValueError):
+        raise TransferError(f"Zeile {line}: shop und order müssen Zahlen sein") from None
+    name = record.get("name") or None
+    return FotoparadiesStatus(shop, order, name, fetch_data=False)
+
+
+def read_orders(file: TextIO, fmt: str) -> Iterator[FotoparadiesStatus]:
+    """Liest Aufträge zeilenweise aus einer CSV- oder JSONL-Datei
+
+    CSV-Dateien brauchen eine Kopfzeile mit den Spalten shop, order und optional name.
+    JSONL-Dateien enthalten pro Zeile ein Objekt mit denselben Schlüsseln.
+
+    Args:
+        file (TextIO): Die geöffnete Datei
+        fmt (str): csv oder jsonl
+
+    Raises:
+        TransferError: Bei einer ungültigen Zeile
+
+    Yields:
+        Iterator[FotoparadiesStatus]: Die gelesenen Aufträge (ohne abgefragten Status)
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(file)
+        for record in reader:
+            yield _to_status(record, reader.line_num)
+        return
+
+    for line, text in enumerate(file, start=1):
+        if not text.strip():
+            continue
+        try:
+            record = json.loads(text)
+        except ValueError:
+            raise TransferError(f"Zeile {line}: kein gültiges JSON") from None
+        if not isinstance(record, dict):
+            raise TransferError(f"Zeile {line}: ein JSON-Objekt wird erwartet")
+        yield _to_status(record, line)
+
+
+def write_orders(orders: Iterable[FotoparadiesStatus], file: TextIO, fmt: str) -> int:
+    """Schreibt Aufträge zeilenweise als CSV oder JSONL
+
+    Args:
+        orders (Iterable[FotoparadiesStatus]): Die Aufträge
+        file (TextIO): Die geöffnete Zieldatei
+        fmt (str): csv oder jsonl
+
+    Returns:
+        int: Anzahl der geschriebenen Aufträge
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(file)
+        writer.writerow(_FIELDS)
+        for order in orders:
+            writer.writerow((order._shop, order._order, order._name or ""))
+            count += 1
+        return count
+
+    for order in orders:
+        record = {"shop": order._shop, "order": order._order, "name": order._name}
+        file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
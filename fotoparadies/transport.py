@@ -0,0 +1,202 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .locking import atomic_write
+
+DEFAULT_BASE_URL = "https://spot.photoprintit.com"
+ORDER_INFO_PATH = "/spotapi/orderInfo/forShop"
+
+Timeout = Union[float, tuple[float, float]]
+
+
+class Transport:
+    """
+    Basisklasse für den Weg, auf dem Anfragen an die orderInfo-Schnittstelle gelangen.
+
+    Eine Implementierung muss ein Objekt zurückgeben, das ``status_code``, ``json()``
+    und ``raise_for_status()`` wie eine ``requests.Response`` anbietet.
+    """
+
+    base_url = DEFAULT_BASE_URL
+
+    @property
+    def url(self) -> str:
+        """Vollständige URL der orderInfo-Schnittstelle
+
+        Returns:
+            str: Die URL
+        """
+        return self.base_url.rstrip("/") + ORDER_INFO_PATH
+
+    def get(self, params: dict[str, int], timeout: Optional[Timeout] = None):
+        """Fragt die orderInfo-Schnittstelle ab
+
+        Args:
+            params (dict[str, int]): Die Abfrageparameter (config, shop, order)
+            timeout (Optional[Timeout], optional): Timeout der Anfrage in Sekunden
+
+        Raises:
+            requests.RequestException: Wenn die Anfrage fehlschlägt
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """Gibt alle Ressourcen des Transports frei"""
+
+
+class HttpTransport(Transport):
+    """
+    Transport über HTTP mit einer gepoolten ``requests.Session``.
+    """
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_BASE_URL,
+        pool_size: int = 10,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+    ) -> None:
+        """Initialisiert den Transport
+
+        Args:
+            base_url (str, optional): Basis-URL der API. Standard ist spot.photoprintit.com.
+            pool_size (int, optional): Maximale Anzahl offener Verbindungen. Standard ist 10.
+            retries (int, optional): Anzahl der Wiederholungsversuche bei Fehlern. Standard ist 3.
+            backoff_factor (float, optional): Faktor für die Wartezeit zwischen Wiederholungen. Standard ist 0.5.
+        """
+        self.base_url = base_url
+
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        # pool_block sorgt dafür, dass bei voller Auslastung auf eine freie Verbindung
+        # gewartet wird, statt zusätzliche Wegwerf-Verbindungen zu öffnen
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=retry,
+            pool_block=True,
+        )
+
+        self._session = requests.Session()
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def get(
+        self, params: dict[str, int], timeout: Optional[Timeout] = None
+    ) -> requests.Response:
+        return self._session.get(self.url, params=params, timeout=timeout)
+
+    def close(self):
+        self._session.close()
+
+
+class FixtureResponse:
+    """
+    Aufgezeichnete Antwort, die sich wie eine ``requests.Response`` verhält.
+    """
+
+    def __init__(self, status_code: int, body: Any, url: str) -> None:
+        self.status_code = status_code
+        self.body = body
+        self.url = url
+
+    def json(self) -> Any:
+        if self.body is None:
+            raise ValueError("Die Antwort enthält kein JSON")
+        return self.body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(
+                f"{self.status_code} Error for url: {self.url}", response=self
+            )
+
+
+def _fixture_key(params: dict[str, int]) -> str:
+    return f"{params['shop']}:{params['order']}:{params['config']}"
+
+
+class ReplayTransport(Transport):
+    """
+    Transport, der aufgezeichnete Antworten aus einer JSON-Datei wiedergibt.
+
+    Die Datei bildet ``"<shop>:<order>:<config>"`` auf ``{"status": ..., "body": ...}`` ab.
+    Nicht aufgezeichnete Aufträge werden mit 404 beantwortet.
+    """
+
+    base_url = "replay://fixtures"
+
+    def __init__(self, path: Path) -> None:
+        """Initialisiert den Transport
+
+        Args:
+            path (Path): Datei mit den aufgezeichneten Antworten
+
+        Raises:
+            OSError: Wenn die Datei nicht gelesen werden kann
+            ValueError: Wenn die Datei kein gültiges JSON-Objekt enthält
+        """
+        self.path = Path(path)
+        with open(self.path, "r", encoding="utf-8") as file:
+            self._fixtures: dict[str, dict[str, Any]] = json.load(file)
+        if not isinstance(self._fixtures, dict):
+            raise ValueError(f"{self.path} enthält keine aufgezeichneten Antworten")
+
+    def get(
+        self, params: dict[str, int], timeout: Optional[Timeout] = None
+    ) -> FixtureResponse:
+        fixture = self._fixtures.get(_fixture_key(params))
+        if fixture is None:
+            return FixtureResponse(404, None, self.url)
+        return FixtureResponse(fixture["status"], fixture.get("body"), self.url)
+
+
+class RecordingTransport(Transport):
+    """
+    Transport, der die Antworten eines anderen Transports für ``ReplayTransport`` aufzeichnet.
+    """
+
+    def __init__(self, inner: Transport, path: Path) -> None:
+        """Initialisiert den Transport
+
+        Args:
+            inner (Transport): Der Transport, dessen Antworten aufgezeichnet werden
+            path (Path): Datei, in die die Antworten beim Schließen geschrieben werden
+        """
+        self.inner = inner
+        self.base_url = inner.base_url
+        self.path = Path(path)
+        self._fixtures: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, params: dict[str, int], timeout: Optional[Timeout] = None):
+        response = self.inner.get(params, timeout=timeout)
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        with self._lock:
+            self._fixtures[_fixture_key(params)] = {
+                "status": response.status_code,
+                "body": body,
+            }
+        return response
+
+    def close(self):
+        with self._lock:
+            atomic_write(self.path, json.dumps(self._fixtures, indent=2))
+        self.inner.close()
@@ -0,0 +1,78 @@
+import time
+from datetime import datetime
+from typing import Callable, Iterator, NamedTuple, Optional
+
+from .batch import DEFAULT_RATE, DEFAULT_WORKERS, iter_refresh
+from .client import FotoparadiesClient, get_default_client
+from .fotoparadies import FotoparadiesStatus
+from .repository import OrderRepository
+from .scheduler import due_orders, seconds_until_next_due
+
+# Spätestens nach dieser Zeit (in Sekunden) wird nach neuen oder geänderten Aufträgen gesehen
+IDLE_WAIT = 30.0
+# Mindestabstand zwischen zwei Durchläufen in Sekunden
+MIN_WAIT = 1.0
+
+
+class Change(NamedTuple):
+    """Statuswechsel eines Auftrags, den ``watch_changes`` bemerkt hat"""
+
+    order: FotoparadiesStatus
+    previous_state: Optional[str]
+    previous_update: Optional[datetime]
+
+    def as_dict(self) -> dict:
+        """Gibt den Wechsel als JSON-taugliches Dictionary zurück
+
+        Returns:
+            dict: Der Wechsel
+        """
+        return {**self.order.as_dict(), "previous_state": self.previous_state}
+
+
+def watch_changes(
+    repository: Optional[OrderRepository] = None,
+    client: Optional[FotoparadiesClient] = None,
+    rate: float = DEFAULT_RATE,
+    max_workers: int = DEFAULT_WORKERS,
+    idle_wait: float = IDLE_WAIT,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[Change]:
+    """Fragt fällige Aufträge dauerhaft ab und liefert nur die Statuswechsel.
+
+    Ablage und Verbindungen bleiben zwischen den Durchläufen geöffnet. Gewartet wird bis
+    zum nächsten fälligen Auftrag, höchstens aber ``idle_wait`` Sekunden, damit
+    zwischenzeitlich hinzugefügte Aufträge zeitnah abgefragt werden.
+
+    Args:
+        repository (Optional[OrderRepository], optional): Die Aufträge. Standard ist ein neuer Zwischenspeicher der geteilten Ablage.
+        client (Optional[FotoparadiesClient], optional): Client für die Anfragen. Standard ist der geteilte Client.
+        rate (float, optional): Maximale Anzahl Anfragen pro Sekunde. Standard ist DEFAULT_RATE.
+        max_workers (int, optional): Maximale Anzahl gleichzeitiger Anfragen. Standard ist DEFAULT_WORKERS.
+        idle_wait (float, optional): Maximale Wartezeit zwischen zwei Durchläufen in Sekunden. Standard ist 30.
+        sleep (Callable[[float], None], optional): Funktion zum Warten. Standard ist time.sleep.
+
+    Yields:
+        Iterator[Change]: Die Statuswechsel in der Reihenfolge, in der sie bemerkt wurden
+    """
+    repository = repository if repository is not None else OrderRepository()
+    client = client if client is not None else get_default_client()
+
+    while True:
+        due = due_orders(repository.all())
+        before = {id(order): (order.currentstatus, order.getlastupdate) for order in due}
+
+        for order in iter_refresh(due, client=client, rate=rate, max_workers=max_workers):
+            previous_state, previous_update = before[id(order)]
+            if (order.currentstatus, order.getlastupdate) != (previous_state, previous_update):
+                yield Change(order, previous_state, previous_update)
+
+        if due:
+            repository.save_status(due)
+        if client.cache is not None:
+            # Damit andere Prozesse die frischen Antworten mitnutzen können
+            client.cache.save()
+
+        seconds = seconds_until_next_due(repository.all())
+        wait = idle_wait if seconds is None else min(seconds, idle_wait)
+        sleep(max(wait, MIN_WAIT))
@@ -0,0 +1,41 @@
+from datetime import datetime
+
+from fotoparadies.fotoparadies import FotoparadiesStatus
+from fotoparadies.repository import OrderRepository
+from fotoparadies.store import OrderStore
+
+
+def _store(tmp_path):
+    # Eigene Datenbank, keine Pickle-Datei früherer Versionen
+    return OrderStore(path=tmp_path / "orders.sqlite3", legacy_path=tmp_path / "orders.pkl")
+
+
+def test_save_status_after_reload_by_other_connection(tmp_path):
+    repository = OrderRepository(_store(tmp_path))
+    repository.add(FotoparadiesStatus(1, 10, fetch_data=False))
+    repository.add(FotoparadiesStatus(1, 11, fetch_data=False))
+
+    # Eine Aktualisierung arbeitet mit den Objekten von vorher ...
+    refreshing = repository.all()
+
+    # ... während ein anderer Prozess schreibt und das Repository neu lädt
+    other = _store(tmp_path)
+    other.add(FotoparadiesStatus(2, 20, fetch_data=False))
+    assert len(repository.all()) == 3
+
+    for status in refreshing:
+        status._state = "READY"
+        status._fetched_at = datetime.now()
+    repository.save_status(refreshing)
+
+    assert [(s.order, s.currentstatus) for s in repository.all()] == [
+        (10, "READY"),
+        (11, "READY"),
+        (20, None),
+    ]
+    assert [(s.order, s.currentstatus) for s in other.all()] == [
+        (10, "READY"),
+        (11, "READY"),
+        (20, None),
+    ]
+    assert repository.find_by_name("10") is refreshing[0]
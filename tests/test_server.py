@@ -0,0 +1,47 @@
+from fotoparadies.client import FotoparadiesClient
+from fotoparadies.fotoparadies import FotoparadiesStatus
+from fotoparadies.repository import OrderRepository
+from fotoparadies.server import ClientOrders, StatusServer, _PolledOrders
+from fotoparadies.standin import StandInServer
+from fotoparadies.store import OrderStore
+
+
+def test_client_orders_are_not_stored(tmp_path):
+    store = OrderStore(path=tmp_path / "orders.sqlite3", legacy_path=tmp_path / "orders.pkl")
+    standin = StandInServer()
+    standin.start_background()
+    server = StatusServer(
+        repository=OrderRepository(store),
+        client=FotoparadiesClient(base_url=standin.base_url),
+    )
+    try:
+        status, payload = server.order_info(1, 42, 1320)
+        assert status == 200
+        assert payload["orderNo"] == 42
+
+        polled = _PolledOrders(server.repository, server.client_orders)
+        orders = polled.all()
+        assert [(order._shop, order._order) for order in orders] == [(1, 42)]
+        orders[0].refresh(server.client)
+        polled.save_status(orders)
+        server.repository.flush()
+        assert store.all() == []
+    finally:
+        standin.shutdown()
+        standin.server_close()
+        server.server_close()
+
+
+def test_client_orders_expire():
+    now = [0.0]
+    orders = ClientOrders(ttl=60, clock=lambda: now[0])
+    assert orders.add(FotoparadiesStatus(1, 42, fetch_data=False))
+    assert not orders.add(FotoparadiesStatus(1, 42, fetch_data=False))
+
+    now[0] = 50
+    assert orders.get(1, 42) is not None  # die Anfrage verlängert die Frist
+    now[0] = 100
+    assert len(orders.all()) == 1
+    now[0] = 111
+    assert orders.all() == []
+    assert orders.get(1, 42) is None